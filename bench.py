@@ -0,0 +1,937 @@
+#!/usr/bin/env python
+# coding=utf-8
+from __future__ import print_function
+import sys
+# Tricks to handle Python3
+PY3 = sys.version_info.major > 2
+if PY3:
+	basestring = str
+
+from underscore import underscore as _
+from underscore import Collection, Index
+import timeit
+import math
+import random
+import functools
+from functools import reduce
+from collections import OrderedDict
+
+# Size of the lists used by the benchmarks, unless a benchmark sets its own
+N = 100000
+
+data   = list(range(0, N))
+people = [{'name': 'user%d' % i, 'age': i % 90, 'id': i} for i in range(0, N)]
+collection = Collection(people)
+indexed    = Index(people, 'id', 'age')
+
+# Iteratees used by the benchmarks; defined once, to avoid measuring the creation of the lambdas
+identity3 = lambda x, i, l: x
+add4      = lambda m, x, i, l: m + x
+negative  = lambda x: x < 0
+odd       = lambda x: x % 2
+even      = lambda x: x % 2 == 0
+positive  = lambda x: x >= 0
+minus     = lambda x: -x
+identity  = lambda x: x
+varargs   = lambda x, *args: x
+add2      = lambda m, x: m + x
+addargs   = lambda m, x, *args: m + x
+
+# Memoized functions
+cachedLru     = functools.lru_cache(maxsize=None)(minus) if PY3 else minus
+cached        = _.memoize(minus)
+cachedLimited = _.memoize(minus, maxsize = 1000)
+cachedTtl     = _.memoize(minus, ttl = 3600)
+smallLru      = functools.lru_cache(maxsize=100)(minus) if PY3 else minus
+small         = _.memoize(minus, maxsize = 100)
+
+# A CPU bound iteratee, for the parallel execution
+def busy(x):
+	return sum(i * i for i in range(0, 200)) + x
+
+cachedBusy = _.memoize(busy)
+
+# Throttled and debounced functions, called in a loop
+noop      = lambda x: None
+throttled = _.throttle(noop, 1.0)
+debounced = _.debounce(noop, 1.0)
+
+# The way the iteratees were dispatched before they were resolved once per call (the "before" in the benchmarks):
+# a test on the type of the iteratee and on the context is made for each element.
+def _exec1(f, context, a1):
+	if isinstance(f, basestring):
+		return a1[f]
+	elif context is None:
+		return f(a1)
+	else:
+		return f(context, a1)
+
+def _exec3(f, context, a1, a2, a3):
+	if context is None:
+		return f(a1, a2, a3)
+	else:
+		return f(context, a1, a2, a3)
+
+def _exec4(f, context, a1, a2, a3, a4):
+	if context is None:
+		return f(a1, a2, a3, a4)
+	else:
+		return f(context, a1, a2, a3, a4)
+
+# The set functions, as they were before using hash based membership tests (the "before" in the benchmarks)
+def _union(*arrays):
+	retval = []
+	for a in arrays:
+		for x in a:
+			if x not in retval:
+				retval.append(x)
+	return retval
+
+def _intersection(*arrays):
+	retval = []
+	for x in arrays[0]:
+		to_be_added = True
+		for Z in arrays[1:]:
+			if x not in Z:
+				to_be_added = False
+				break
+		if to_be_added: retval.append(x)
+	return retval
+
+def _difference(array, *others):
+	retval = []
+	for x in array:
+		to_be_added = True
+		for A in others:
+			if x in A:
+				to_be_added = False
+				break
+		if to_be_added: retval.append(x)
+	return retval
+
+# shuffle, as it was before it used random.shuffle on a copy (the "before" in the benchmarks)
+def _shuffle(lst):
+	indeces = list(range(0, len(lst)))
+	random.shuffle(indeces)
+	return [lst[i] for i in indeces]
+
+# before and after, as they were before being module level classes (the "before" in the benchmarks)
+def _before(count, func):
+	class _before(object):
+		def __init__(self, before_count, before_func):
+			self.count  = before_count
+			self.called = 0
+			self.retval = None
+			self.func   = before_func
+
+		def __call__(self, *args, **keywords):
+			if self.called < self.count:
+				self.retval = self.func(*args, **keywords)
+				self.called += 1
+				return self.retval
+			else:
+				return self.retval
+	return _before(count, func)
+
+def _after(count, func):
+	class _after(object):
+		def __init__(self, after_count, after_func):
+			self.count  = after_count
+			self.called = 0
+			self.func   = after_func
+
+		def __call__(self, *args, **keywords):
+			if self.called == self.count:
+				return self.func(*args, **keywords)
+			else:
+				self.called += 1
+	return _after(count, func)
+
+# partial, as it was before
+def _partial(func, *args, **keywords):
+	def combine(a, b):
+		retval = ()
+		for i in range(0, len(a)):
+			if a[i] is None:
+				retval += tuple([b[0]])
+				b = b[1:]
+			else:
+				retval += tuple([a[i]])
+		return retval + b
+
+	def newfunc(*fargs, **fkeywords):
+		newkeywords = keywords.copy()
+		newkeywords.update(fkeywords)
+		return func(*(combine(args, fargs)), **newkeywords)
+	return newfunc
+
+# compose, as it was before
+def _compose(*functions):
+	def ff(*args,**keywords):
+		nextarg = functions[-1](*args, **keywords)
+		for i in range(len(functions) - 2, -1, -1):
+			nextarg = functions[i](nextarg)
+		return nextarg
+	return ff
+
+# The matching of properties, as it was before the predicates were compiled (the "before" in the benchmarks)
+def _extends(obj, ext):
+	if isinstance(obj, dict) and isinstance(ext, dict):
+		for key in ext:
+			if key not in obj or obj[key] != ext[key]:
+				return False
+		return True
+	return False
+
+def _where(lst, properties):
+	return [x for x in lst if _extends(x, properties)]
+
+class OneBenchmark:
+	def __init__(self, benchName, toRun, size = N, repeat = 5, setup = None):
+		"""
+		benchName: arbitrary text to label the output of a specific benchmark
+		toRun: a list of (label, statement) pairs; each statement is a string, timed through timeit in the global namespace of this module. The first entry is considered to be the reference for the others.
+		size: the number of elements processed by one execution of the statements; used to display the per element cost
+		repeat: the number of times each statement is executed (the best run is displayed)
+		setup: an optional statement (string) executed, in the global namespace of this module, before each run
+		"""
+		self.glob   = globals()
+		self.name   = benchName
+		self.toRun  = toRun
+		self.size   = size
+		self.repeat = repeat
+		self.setup  = setup if setup is not None else "pass"
+
+	def execute_and_display(self):
+		print("\n== Benchmark: '%s' (%d elements) ==" % (self.name, self.size))
+		reference = None
+		for (label, statement) in self.toRun:
+			best = min(timeit.repeat(statement, setup=self.setup, globals=self.glob, number=1, repeat=self.repeat)) if PY3 \
+				else min(timeit.Timer(statement, setup=self.setup).repeat(number=1, repeat=self.repeat))
+			if reference is None:
+				reference = best
+			print("   %-40s %10.2f ms %10.1f ns/element %8.2fx" % (label, best * 1000, best * 1e9 / self.size, reference / best))
+
+_benchmarks = [
+	(
+		"iteratee",
+		[
+			OneBenchmark(
+					"each",
+					[
+						("before", "for i in range(0, len(data)): _exec3(identity3, None, data[i], i, data)"),
+						("after", "_.each(data, identity3)"),
+					]
+			),
+			OneBenchmark(
+					"map",
+					[
+						("before", "[_exec3(identity3, None, data[i], i, data) for i in range(0, len(data))]"),
+						("after", "_.map(data, identity3)"),
+					]
+			),
+			OneBenchmark(
+					"reduce",
+					[
+						("before", "reduce(lambda m, i: _exec4(add4, None, m, data[i], i, data), range(0, len(data)), 0)"),
+						("after", "_.reduce(data, add4, 0)"),
+					]
+			),
+			OneBenchmark(
+					"find",
+					[
+						("before", "[x for x in data if _exec1(negative, None, x)]"),
+						("after", "_.find(data, negative)"),
+					]
+			),
+			OneBenchmark(
+					"filter",
+					[
+						("before", "[x for x in data if _exec1(odd, None, x)]"),
+						("after", "_.filter(data, odd)"),
+					]
+			),
+			OneBenchmark(
+					"reject",
+					[
+						("before", "[x for x in data if not _exec1(odd, None, x)]"),
+						("after", "_.reject(data, odd)"),
+					]
+			),
+			OneBenchmark(
+					"every",
+					[
+						("before", "[x for x in data if not _exec1(positive, None, x)]"),
+						("after", "_.every(data, positive)"),
+					]
+			),
+			OneBenchmark(
+					"some",
+					[
+						("before", "[x for x in data if _exec1(negative, None, x)]"),
+						("after", "_.some(data, negative)"),
+					]
+			),
+			OneBenchmark(
+					"max, with a property name",
+					[
+						("before", "max(people, key=lambda x: _exec1('age', None, x))"),
+						("after", "_.max(people, 'age')"),
+					]
+			),
+			OneBenchmark(
+					"max",
+					[
+						("before", "max(data, key=lambda x: _exec1(minus, None, x))"),
+						("after", "_.max(data, minus)"),
+					]
+			),
+			OneBenchmark(
+					"min",
+					[
+						("before", "min(data, key=lambda x: _exec1(minus, None, x))"),
+						("after", "_.min(data, minus)"),
+					]
+			),
+			OneBenchmark(
+					"sortBy",
+					[
+						("before", "sorted(data, key=lambda x: _exec1(minus, None, x))"),
+						("after", "_.sortBy(data, minus)"),
+					]
+			),
+			OneBenchmark(
+					"groupBy, with a property name",
+					[
+						("before", "reduce(lambda r, x: r.setdefault(_exec1('age', None, x), []).append(x) or r, people, {})"),
+						("after", "_.groupBy(people, 'age')"),
+					]
+			),
+			OneBenchmark(
+					"groupBy",
+					[
+						("before", "reduce(lambda r, x: r.setdefault(_exec1(odd, None, x), []).append(x) or r, data, {})"),
+						("after", "_.groupBy(data, odd)"),
+					]
+			),
+			OneBenchmark(
+					"indexBy",
+					[
+						("before", "dict((k, v[0]) for (k, v) in reduce(lambda r, x: r.setdefault(_exec1(odd, None, x), []).append(x) or r, data, {}).items())"),
+						("after", "_.indexBy(data, odd)"),
+					]
+			),
+			OneBenchmark(
+					"countBy",
+					[
+						("before", "dict((k, len(v)) for (k, v) in reduce(lambda r, x: r.setdefault(_exec1(odd, None, x), []).append(x) or r, data, {}).items())"),
+						("after", "_.countBy(data, odd)"),
+					]
+			),
+			OneBenchmark(
+					"partition",
+					[
+						("before", "[x for x in data if _exec1(even, None, x) is True]"),
+						("after", "_.partition(data, even)"),
+					]
+			),
+			OneBenchmark(
+					"findIndex",
+					[
+						("before", "[i for i in range(0, len(data)) if _exec1(negative, None, data[i])]"),
+						("after", "_.findIndex(data, negative)"),
+					]
+			),
+			OneBenchmark(
+					"times",
+					[
+						("before", "[_exec1(identity, None, i) for i in range(0, len(data))]"),
+						("after", "_.times(len(data), identity)"),
+					]
+			),
+		]
+	),
+	# The "before" versions are quadratic, and are left out for the larger lists
+	(
+		"sets",
+		[
+			OneBenchmark(
+					"union, 1000 elements per list",
+					[
+						("before", "_union(A, B)"),
+						("after", "_.union(A, B)"),
+					],
+					size = 1000,
+					setup = "A = list(range(0, 1000)); B = list(range(500, 1500))"
+			),
+			OneBenchmark(
+					"intersection, 1000 elements per list",
+					[
+						("before", "_intersection(A, B)"),
+						("after", "_.intersection(A, B)"),
+					],
+					size = 1000,
+					setup = "A = list(range(0, 1000)); B = list(range(500, 1500))"
+			),
+			OneBenchmark(
+					"difference, 1000 elements per list",
+					[
+						("before", "_difference(A, B)"),
+						("after", "_.difference(A, B)"),
+					],
+					size = 1000,
+					setup = "A = list(range(0, 1000)); B = list(range(500, 1500))"
+			),
+			OneBenchmark(
+					"union, 10000 elements per list",
+					[
+						("before", "_union(A, B)"),
+						("after", "_.union(A, B)"),
+					],
+					size = 10000,
+					setup = "A = list(range(0, 10000)); B = list(range(5000, 15000))"
+			),
+			OneBenchmark(
+					"intersection, 10000 elements per list",
+					[
+						("before", "_intersection(A, B)"),
+						("after", "_.intersection(A, B)"),
+					],
+					size = 10000,
+					setup = "A = list(range(0, 10000)); B = list(range(5000, 15000))"
+			),
+			OneBenchmark(
+					"difference, 10000 elements per list",
+					[
+						("before", "_difference(A, B)"),
+						("after", "_.difference(A, B)"),
+					],
+					size = 10000,
+					setup = "A = list(range(0, 10000)); B = list(range(5000, 15000))"
+			),
+			OneBenchmark(
+					"union, 100000 elements per list",
+					[
+						("after", "_.union(A, B)"),
+					],
+					size = 100000,
+					setup = "A = list(range(0, 100000)); B = list(range(50000, 150000))"
+			),
+			OneBenchmark(
+					"intersection, 100000 elements per list",
+					[
+						("after", "_.intersection(A, B)"),
+					],
+					size = 100000,
+					setup = "A = list(range(0, 100000)); B = list(range(50000, 150000))"
+			),
+			OneBenchmark(
+					"difference, 100000 elements per list",
+					[
+						("after", "_.difference(A, B)"),
+					],
+					size = 100000,
+					setup = "A = list(range(0, 100000)); B = list(range(50000, 150000))"
+			),
+			OneBenchmark(
+					"union, 1000000 elements per list",
+					[
+						("after", "_.union(A, B)"),
+					],
+					size = 1000000,
+					setup = "A = list(range(0, 1000000)); B = list(range(500000, 1500000))"
+			),
+			OneBenchmark(
+					"intersection, 1000000 elements per list",
+					[
+						("after", "_.intersection(A, B)"),
+					],
+					size = 1000000,
+					setup = "A = list(range(0, 1000000)); B = list(range(500000, 1500000))"
+			),
+			OneBenchmark(
+					"difference, 1000000 elements per list",
+					[
+						("after", "_.difference(A, B)"),
+					],
+					size = 1000000,
+					setup = "A = list(range(0, 1000000)); B = list(range(500000, 1500000))"
+			),
+		]
+	),
+	(
+		"parallel",
+		[
+			OneBenchmark(
+					"map with a CPU bound function",
+					[
+						("serial", "_.map(data, busy)"),
+						("2 workers", "_.map(data, busy, workers = 2)"),
+						("4 workers", "_.map(data, busy, workers = 4)"),
+						("4 workers, 1000 elements per chunk", "_.map(data, busy, workers = 4, chunksize = 1000)"),
+					],
+					repeat = 1
+			),
+			OneBenchmark(
+					"filter with a CPU bound function",
+					[
+						("serial", "_.filter(data, busy)"),
+						("4 workers", "_.filter(data, busy, workers = 4)"),
+					],
+					repeat = 1
+			),
+		]
+	),
+	(
+		"collection",
+		[
+			OneBenchmark(
+					"pluck",
+					[
+						("list of dictionaries", "_.pluck(people, 'age')"),
+						("collection", "_.pluck(collection, 'age')"),
+					]
+			),
+			OneBenchmark(
+					"where",
+					[
+						("list of dictionaries", "_.where(people, {'age': 42})"),
+						("collection", "_.where(collection, {'age': 42})"),
+					]
+			),
+			OneBenchmark(
+					"sortBy",
+					[
+						("list of dictionaries", "_.sortBy(people, 'age')"),
+						("collection", "_.sortBy(collection, 'age')"),
+					]
+			),
+			OneBenchmark(
+					"groupBy",
+					[
+						("list of dictionaries", "_.groupBy(people, 'age')"),
+						("collection", "_.groupBy(collection, 'age')"),
+					]
+			),
+			OneBenchmark(
+					"countBy",
+					[
+						("list of dictionaries", "_.countBy(people, 'age')"),
+						("collection", "_.countBy(collection, 'age')"),
+					]
+			),
+		]
+	),
+	(
+		"index",
+		[
+			OneBenchmark(
+					"findWhere",
+					[
+						("list of dictionaries", "_.findWhere(people, {'id': N // 2})"),
+						("index", "_.findWhere(indexed, {'id': N // 2})"),
+					]
+			),
+			OneBenchmark(
+					"where",
+					[
+						("list of dictionaries", "_.where(people, {'age': 42})"),
+						("index", "_.where(indexed, {'age': 42})"),
+					]
+			),
+			OneBenchmark(
+					"filter with a matcher",
+					[
+						("list of dictionaries", "_.filter(people, _.matcher({'age': 42, 'id': 42}))"),
+						("index", "_.filter(indexed, _.matcher({'age': 42, 'id': 42}))"),
+					]
+			),
+		]
+	),
+	(
+		"aggregation",
+		[
+			OneBenchmark(
+					"countBy",
+					[
+						("grouping", "{k: len(g) for (k, g) in _.groupBy(people, 'age').items()}"),
+						("counting", "_.countBy(people, 'age')"),
+					]
+			),
+			OneBenchmark(
+					"aggregateBy",
+					[
+						("grouping", "{k: {'n': len(g), 'total': sum(p['id'] for p in g), 'oldest': max(p['id'] for p in g)} for (k, g) in _.groupBy(people, 'age').items()}"),
+						("one pass", "_.aggregateBy(people, 'age', {'n': 'count', 'total': ('sum', 'id'), 'oldest': ('max', 'id')})"),
+						("collection", "_.aggregateBy(collection, 'age', {'n': 'count', 'total': ('sum', 'id'), 'oldest': ('max', 'id')})"),
+					]
+			),
+			OneBenchmark(
+					"indexBy",
+					[
+						("grouping", "{k: g[0] for (k, g) in _.groupBy(people, 'age').items()}"),
+						("first element", "_.indexBy(people, 'age')"),
+						("last element", "_.indexBy(people, 'age', last = True)"),
+					]
+			),
+		]
+	),
+	(
+		"sorting",
+		[
+			OneBenchmark(
+					"two keys, one descending",
+					[
+						("two stable sorts", "_.sortBy(_.sortBy(people, lambda p: p['name']), lambda p: -p['age'])"),
+						("multi-key", "_.sortBy(people, ['-age', 'name'])"),
+					]
+			),
+			OneBenchmark(
+					"two ascending keys",
+					[
+						("tuple key function", "_.sortBy(people, lambda p: (p['age'], p['name']))"),
+						("multi-key", "_.sortBy(people, ['age', 'name'])"),
+					]
+			),
+			OneBenchmark(
+					"copy or in place",
+					[
+						("copy", "_.sortBy(unsorted, 'age')"),
+						("in place", "_.sortBy(unsorted, 'age', inPlace = True)"),
+					],
+					setup = "unsorted = list(reversed(people))"
+			),
+		]
+	),
+	(
+		"external",
+		[
+			OneBenchmark(
+					"sortBy, budget of " + label,
+					[
+						("in memory", "_.sortBy(people, ['age', 'name'])"),
+						("external", "list(_.lazy.sortBy(iter(people), ['age', 'name'], budget = %d))" % budget),
+					],
+					repeat = 3
+			) for (label, budget) in [("all values", N + 1), ("N/2 values", N // 2), ("N/10 values", N // 10), ("N/100 values", N // 100)]
+		]
+	),
+	(
+		"selection",
+		[
+			OneBenchmark(
+					"10 largest",
+					[
+						("sortBy", "_.sortBy(people, 'age')[-10:]"),
+						("topBy", "_.topBy(people, 10, 'age')"),
+					]
+			),
+			OneBenchmark(
+					"1000 largest",
+					[
+						("sortBy", "_.sortBy(people, 'age')[-1000:]"),
+						("topBy", "_.topBy(people, 1000, 'age')"),
+					]
+			),
+		]
+	),
+	(
+		"sampling",
+		[
+			OneBenchmark(
+					"sample of 100 from a generator",
+					[
+						("list, then sample", "_.sample(list(x for x in data), 100)"),
+						("reservoir", "_.sample((x for x in data), 100)"),
+					]
+			),
+			OneBenchmark(
+					"shuffle",
+					[
+						("before", "_shuffle(data)"),
+						("copy", "_.shuffle(data)"),
+						("in place", "_.shuffle(data, inPlace = True)"),
+					]
+			),
+		]
+	),
+	(
+		"memoize",
+		[
+			OneBenchmark(
+					"cache hits",
+					[
+						("functools.lru_cache", "[cachedLru(x) for x in keys]"),
+						("memoize", "[cached(x) for x in keys]"),
+						("memoize, maxsize", "[cachedLimited(x) for x in keys]"),
+						("memoize, ttl", "[cachedTtl(x) for x in keys]"),
+					],
+					setup = "keys = [i % 100 for i in data]"
+			),
+			OneBenchmark(
+					"CPU bound function, 100 distinct arguments",
+					[
+						("no cache", "[busy(x) for x in keys]"),
+						("memoize", "[cachedBusy(x) for x in keys]"),
+					],
+					setup = "keys = [i % 100 for i in data]"
+			),
+			OneBenchmark(
+					"misses and evictions",
+					[
+						("functools.lru_cache", "[smallLru(x) for x in data]"),
+						("memoize, maxsize", "[small(x) for x in data]"),
+					],
+			),
+		]
+	),
+	(
+		"partial",
+		[
+			OneBenchmark(
+					"calls without placeholders",
+					[
+						("before", "[oldPartial(x) for x in data]"),
+						("functools.partial", "[newPartial(x) for x in data]"),
+					],
+					setup = "f = lambda a, b, c: c; oldPartial = _partial(f, 1, 2); newPartial = _.partial(f, 1, 2)"
+			),
+			OneBenchmark(
+					"calls with placeholders",
+					[
+						("before", "[oldPartial(x, x) for x in data]"),
+						("precomputed positions", "[newPartial(x, x) for x in data]"),
+					],
+					setup = "f = lambda a, b, c, d, e: e; oldPartial = _partial(f, None, 2, None, 4, 5); newPartial = _.partial(f, None, 2, None, 4, 5)"
+			),
+			OneBenchmark(
+					"calls with placeholders and extra arguments",
+					[
+						("before", "[oldPartial(x, x, x, x) for x in data]"),
+						("precomputed positions", "[newPartial(x, x, x, x) for x in data]"),
+					],
+					setup = "f = lambda a, b, c, d, e: e; oldPartial = _partial(f, None, 2, None); newPartial = _.partial(f, None, 2, None)"
+			),
+			OneBenchmark(
+					"calls with placeholders and keywords",
+					[
+						("before", "[oldPartial(x, c=x) for x in data]"),
+						("precomputed positions", "[newPartial(x, c=x) for x in data]"),
+					],
+					setup = "f = lambda a, b, c, d=0: d; oldPartial = _partial(f, None, 2, d=4); newPartial = _.partial(f, None, 2, d=4)"
+			),
+		]
+	),
+	(
+		"compose",
+		[
+			OneBenchmark(
+					"composition of 8 functions",
+					[
+						("before", "[old(x) for x in data]"),
+						("precomputed stages", "[new(x) for x in data]"),
+					],
+					setup = "inc = lambda x: x + 1; old = _compose(*([inc] * 8)); new = _.compose(*([inc] * 8))"
+			),
+			OneBenchmark(
+					"4 nested compositions of 2 functions",
+					[
+						("before", "[old(x) for x in data]"),
+						("flattened", "[new(x) for x in data]"),
+					],
+					setup = "inc = lambda x: x + 1; old = _compose(*([_compose(inc, inc)] * 4)); new = _.compose(*([_.compose(inc, inc)] * 4))"
+			),
+		]
+	),
+	(
+		"once",
+		[
+			OneBenchmark(
+					"creation of once",
+					[
+						("before", "[_before(1, noop) for i in range(0, 10000)]"),
+						("module level class", "[_.once(noop) for i in range(0, 10000)]"),
+					],
+					size = 10000
+			),
+			OneBenchmark(
+					"calls of once",
+					[
+						("before", "[oldOnce(x) for x in data]"),
+						("module level class", "[newOnce(x) for x in data]"),
+					],
+					setup = "oldOnce = _before(1, noop); newOnce = _.once(noop)",
+					repeat = 20
+			),
+			OneBenchmark(
+					"calls of after",
+					[
+						("before", "[oldAfter(x) for x in data]"),
+						("module level class", "[newAfter(x) for x in data]"),
+					],
+					setup = "oldAfter = _after(10, noop); newAfter = _.after(10, noop)",
+					repeat = 20
+			),
+		]
+	),
+	(
+		"throttle",
+		[
+			OneBenchmark(
+					"call overhead",
+					[
+						("direct calls", "[noop(x) for x in data]"),
+						("throttled calls", "[throttled(x) for x in data]"),
+						("debounced calls", "[debounced(x) for x in data]"),
+					]
+			),
+		]
+	),
+	(
+		"matcher",
+		[
+			OneBenchmark(
+					"where, one property",
+					[
+						("before", "_where(people, {'age': 42})"),
+						("compiled", "_.where(people, {'age': 42})"),
+					]
+			),
+			OneBenchmark(
+					"where, three properties",
+					[
+						("before", "_where(people, {'age': 42, 'id': 42, 'name': 'user42'})"),
+						("compiled", "_.where(people, {'age': 42, 'id': 42, 'name': 'user42'})"),
+					]
+			),
+			OneBenchmark(
+					"matcher creation",
+					[
+						("compiled", "[_._compile_matcher({'age': 42, 'id': 42}) for i in range(0, 1000)]"),
+						("cached", "[_.matcher({'age': 42, 'id': 42}) for i in range(0, 1000)]"),
+					],
+					size = 1000
+			),
+		]
+	),
+	(
+		"arity",
+		[
+			OneBenchmark(
+					"each",
+					[
+						("lambda x, *args", "_.each(data, varargs)"),
+						("lambda x", "_.each(data, identity)"),
+					]
+			),
+			OneBenchmark(
+					"map",
+					[
+						("lambda x, *args", "_.map(data, varargs)"),
+						("lambda x", "_.map(data, identity)"),
+					]
+			),
+			OneBenchmark(
+					"reduce",
+					[
+						("lambda m, x, *args", "_.reduce(data, addargs, 0)"),
+						("lambda m, x", "_.reduce(data, add2, 0)"),
+					]
+			),
+		]
+	),
+]
+# NumPy is optional; the NumPy benchmarks are run only if it is available
+try:
+	import numpy
+	array  = numpy.array(data)
+	sine   = _.vectorized(numpy.sin)
+	evenv  = _.vectorized(lambda a: a % 2 == 0)
+	modulo = _.vectorized(lambda a: a % 100)
+	_benchmarks.append(
+		(
+			"numpy",
+			[
+				OneBenchmark(
+						"max",
+						[
+							("list", "_.max(data)"),
+							("array", "_.max(array)"),
+						]
+				),
+				OneBenchmark(
+						"min with an iteratee",
+						[
+							("list", "_.min(data, minus)"),
+							("array", "_.min(array, numpy.negative)"),
+						]
+				),
+				OneBenchmark(
+						"sortBy",
+						[
+							("list", "_.sortBy(data, math.sin)"),
+							("array", "_.sortBy(array, sine)"),
+						]
+				),
+				OneBenchmark(
+						"countBy",
+						[
+							("list", "_.countBy(data, lambda x: x % 100)"),
+							("array", "_.countBy(array, modulo)"),
+						]
+				),
+				OneBenchmark(
+						"compact",
+						[
+							("list", "_.compact(data)"),
+							("array", "_.compact(array)"),
+						]
+				),
+				OneBenchmark(
+						"filter",
+						[
+							("list", "_.filter(data, even)"),
+							("array", "_.filter(array, evenv)"),
+						]
+				),
+				OneBenchmark(
+						"sortedIndex",
+						[
+							("list", "_.sortedIndex(data, N // 2, minus)"),
+							("array", "_.sortedIndex(array, N // 2, numpy.negative)"),
+						]
+				),
+				OneBenchmark(
+						"range",
+						[
+							("list", "_.range(0, N)"),
+							("array", "_.range(0, N, asarray = True)"),
+						]
+				),
+			]
+		)
+	)
+except ImportError:
+	pass
+
+AllBenchmarks = OrderedDict(_benchmarks)
+
+def run_benchmarks(argv):
+	def display_one_benchmark_group(key) :
+		print("\n=== Run benchmark group '%s' ===" % key)
+		for bench in AllBenchmarks[key] :
+			bench.execute_and_display()
+		print("=== End of benchmark group '%s' ===" % key)
+
+	if len(argv) > 1:
+		if argv[1] == 'all':
+			for key in AllBenchmarks:
+				display_one_benchmark_group(key)
+		else:
+			display_one_benchmark_group(sys.argv[1])
+	else:
+		key = list(AllBenchmarks.keys())[-1] if PY3 else AllBenchmarks.keys()[-1]
+		display_one_benchmark_group(key)
+
+if __name__ == '__main__':
+	run_benchmarks(sys.argv)
@@ -3,13 +3,13 @@
 from distutils.core import setup
 
 setup(name='underscore_py',
-    version = '2.0',
+    version = '2.1',
     description = 'Set of utilities to make a functional-programming style usage of Python easier',
     author = 'Ivan Herman',
     author_email = 'ivan@ivan-herman.net',
     url = 'https://github.com/iherman/underscore_py',
     license = 'https://www.w3.org/Consortium/Legal/2015/copyright-software-and-document',
-    py_modules = ['underscore'],
+    py_modules = ['underscore', 'underscore_async'],
     classifiers = [
         'Intended Audience :: Developers',
         'Programming Language :: Python',
@@ -6,7 +6,14 @@ import sys
 PY3 = sys.version_info.major > 2
 
 from underscore import underscore as _
+from underscore import IterateeErrors, Collection, Index
 import math
+import operator
+import os
+import random
+import threading
+import time
+from functools import reduce
 from collections import OrderedDict
 
 def isPrime(n):
@@ -150,6 +157,25 @@ _tests = [
 					"_.map({'one': 1, 'two': 2, 'three': 3}, lambda val, key, *args: val * 4)"
 			),
 
+			OneTest(
+					"map with a one argument function",
+					"[3, 6, 9]",
+					[],
+					"_.map([1, 2, 3], lambda num: num * 3)"
+			),
+			OneTest(
+					"map with an argument having a default value",
+					"[101, 102]",
+					[],
+					"_.map([1, 2], lambda x, y = 100: x + y)"
+			),
+			OneTest(
+					"map with a pool of processes",
+					"[False, False, True, True, False, True, False, True, False, False]",
+					[],
+					"_.map(_.range(10), isPrime, workers = 2)"
+			),
+
 			OneTest(
 					"map with no iterator function",
 					"[1, 2, 3, 4]",
@@ -158,6 +184,88 @@ _tests = [
 			)
 		]
 	),
+	(
+		"mapThreaded",
+		[
+			OneTest(
+					"map with a pool of threads",
+					"[3, 6, 9]",
+					[],
+					"_.mapThreaded([1, 2, 3], lambda num: num * 3, workers = 2)"
+			),
+			OneTest(
+					"map with a pool of threads, results in order of completion",
+					"[1, 2, 3]",
+					[],
+					[
+						("import time", True),
+						("_.mapThreaded([0.2, 0.1, 0.0], lambda x: time.sleep(x) or int(10 * x) + 1, ordered = False)", False)
+					]
+			),
+			OneTest(
+					"map with a pool of threads, with errors",
+					"[(1, ZeroDivisionError('integer division or modulo by zero')), (3, ZeroDivisionError('integer division or modulo by zero'))]\n[2, 1]",
+					[],
+					[
+						("try:\n\t_.mapThreaded([1, 0, 2, 0], lambda x: 2 // x)\nexcept IterateeErrors as e:\n\terrors = e", True),
+						("errors.errors", False),
+						("errors.results", False)
+					]
+			),
+		]
+	),
+	(
+		"amap",
+		[
+			OneTest(
+					"map with a coroutine, at most 2 running at a time",
+					"[3, 6, 9]",
+					[],
+					[
+						("import asyncio", True),
+						("async def triple(num):\n\tawait asyncio.sleep(0.01)\n\treturn num * 3", True),
+						("asyncio.run(_.amap([1, 2, 3], triple, limit = 2))", False)
+					]
+			),
+			OneTest(
+					"find with a coroutine, the other calls being cancelled",
+					"2\n[0, 1, 2, 3]",
+					[],
+					[
+						("import asyncio", True),
+						("started = []", True),
+						("async def isTwo(num):\n\tstarted.append(num)\n\tawait asyncio.sleep(0.01)\n\treturn num == 2", True),
+						("asyncio.run(_.afind(range(0, 100), isTwo, limit = 2))", False),
+						("started", False)
+					]
+			),
+			OneTest(
+					"filter of an asynchronous generator, read as the calls are started",
+					"[0, 2, 4]\n[('read', 0), ('read', 1), ('read', 2), ('call', 0), ('call', 1)]",
+					[],
+					[
+						("import asyncio", True),
+						("events = []", True),
+						("async def numbers():\n\tfor i in range(0, 6):\n\t\tevents.append(('read', i))\n\t\tyield i", True),
+						("async def isEven(num):\n\tevents.append(('call', num))\n\tawait asyncio.sleep(0.01)\n\treturn num % 2 == 0", True),
+						("asyncio.run(_.afilter(numbers(), isEven, limit = 2))", False),
+						("events[0:5]", False)
+					]
+			),
+			OneTest(
+					"a failed call stops the reading of the input",
+					"ValueError\n[0, 1]",
+					[],
+					[
+						("import asyncio", True),
+						("started = []", True),
+						("async def check(num):\n\tstarted.append(num)\n\tawait asyncio.sleep(0.01)\n\tif num == 1: raise ValueError()\n\treturn True", True),
+						("try:\n\tasyncio.run(_.agroupBy(range(0, 100), check, limit = 2))\nexcept ValueError:\n\tprint('ValueError')", True),
+						("started", False)
+					]
+			),
+		]
+	),
 	(
 		"reduce",
 		[
@@ -173,6 +281,13 @@ _tests = [
 					[],
 					"_.reduce([1, 2, 3], lambda memo, num, *args: memo + num)"
 			),
+
+			OneTest(
+					"reduce with a two argument function",
+					"6",
+					[],
+					"_.reduce([1, 2, 3], lambda memo, num: memo + num)"
+			),
 			OneTest(
 					"reduce with dictionary",
 					"48",
@@ -343,6 +458,31 @@ _tests = [
 					[stooges0],
 					"_.sortBy(stooges0, 'name')"
 			),
+			OneTest(
+					"sort by several keys, with a descending one",
+					"[{'name': 'curly', 'age': 60}, {'name': 'joe', 'age': 60}, {'name': 'larry', 'age': 50}, {'name': 'moe', 'age': 40}]\n[{'name': 'moe', 'age': 40}, {'name': 'larry', 'age': 50}, {'name': 'joe', 'age': 60}, {'name': 'curly', 'age': 60}]",
+					[stooges],
+					[
+						("_.sortBy(stooges, ['-age', 'name'])", False),
+						("_.sortBy(stooges, ['age', (lambda st: st['name'], True)])", False)
+					]
+			),
+			OneTest(
+					"sort by a tuple of property names",
+					"[{'name': 'moe', 'age': 40}, {'name': 'larry', 'age': 50}, {'name': 'curly', 'age': 60}, {'name': 'joe', 'age': 60}]",
+					[stooges],
+					"_.sortBy(stooges, ('age', 'name'))"
+			),
+			OneTest(
+					"sort in place",
+					"True\n[1, 2, 3]",
+					[],
+					[
+						("l = [3, 1, 2]", True),
+						("_.sortBy(l, inPlace = True) is l", False),
+						("l", False)
+					]
+			),
 		]
 	),
 	(
@@ -370,6 +510,12 @@ _tests = [
 					"{40: {'name': 'moe', 'age': 40}, 50: {'name': 'larry', 'age': 50}, 60: {'name': 'curly', 'age': 60}}",
 					[stooges0],
 					"_.indexBy(stooges0, 'age')"
+			),
+			OneTest(
+					"indexBy on a generator, keeping the last element",
+					"{40: {'name': 'moe', 'age': 40}, 50: {'name': 'larry', 'age': 50}, 60: {'name': 'joe', 'age': 60}}",
+					[stooges],
+					"_.indexBy((st for st in stooges), 'age', last = True)"
 			)
 		]
 	),
@@ -381,9 +527,67 @@ _tests = [
 					"{'even': 2, 'odd': 3}",
 					[],
 					"_.countBy([1, 2, 3, 4, 5], lambda num: 'even' if num % 2 == 0 else 'odd')"
+			),
+			OneTest(
+					"countBy on a generator",
+					"{0: 2, 1: 1}",
+					[],
+					"_.countBy((x % 2 for x in range(0, 3)))"
 			)
 		]
 	),
+	(
+		"topBy",
+		[
+			OneTest(
+					"top values, ties in order",
+					"[{'name': 'curly', 'age': 60}, {'name': 'joe', 'age': 60}]\n[{'name': 'curly', 'age': 60}, {'name': 'joe', 'age': 60}, {'name': 'larry', 'age': 50}]",
+					[stooges],
+					[
+						("_.topBy(stooges, 2, 'age')", False),
+						("_.max(stooges, 'age', n = 3)", False)
+					]
+			),
+			OneTest(
+					"bottom values of a generator",
+					"[1, 3]\n[1, 3, 5]",
+					[],
+					[
+						("_.bottomBy((x for x in [5, 3, 8, 1, 9]), 2)", False),
+						("_.min(iter([5, 3, 8, 1, 9]), n = 3)", False)
+					]
+			),
+		]
+	),
+	(
+		"aggregateBy",
+		[
+			OneTest(
+					"aggregates per key",
+					"{'Shakespeare': {'n': 3, 'first': 1601, 'last': 1611}}",
+					[listOfPlays],
+					"_.aggregateBy(listOfPlays, 'author', {'n': 'count', 'first': ('min', 'year'), 'last': ('max', 'year')})"
+			),
+			OneTest(
+					"aggregates per composite key, as records",
+					"[{'author': 'Shakespeare', 'year': 1611, 'n': 2}, {'author': 'Shakespeare', 'year': 1601, 'n': 1}]",
+					[listOfPlays],
+					"_.aggregateBy(listOfPlays, ['author', 'year'], {'n': 'count'}, records = True)"
+			),
+			OneTest(
+					"sum and mean on a generator",
+					"{'even': {'total': 20, 'mean': 4.0}, 'odd': {'total': 25, 'mean': 5.0}}",
+					[],
+					"_.aggregateBy((x for x in range(0, 10)), lambda x: 'even' if x % 2 == 0 else 'odd', {'total': ('sum', _.identity), 'mean': ('mean', _.identity)})"
+			),
+			OneTest(
+					"function key on a collection",
+					"{3: {'n': 2, 'mean': 50.0}, 5: {'n': 2, 'mean': 55.0}}",
+					[stooges],
+					"_.aggregateBy(Collection(stooges), lambda st: len(st['name']), {'n': 'count', 'mean': ('mean', 'age')})"
+			),
+		]
+	),
 	(
 		"shuffle",
 		[
@@ -392,6 +596,16 @@ _tests = [
 					"(random order of [1,2,3,4,5])",
 					[],
 					"_.shuffle([1, 2, 3, 4, 5, 6])"
+			),
+			OneTest(
+					"shuffle in place, with a seeded generator",
+					"True\nTrue",
+					[],
+					[
+						("l = [1, 2, 3, 4, 5, 6]", True),
+						("_.shuffle(l, inPlace = True, rng = random.Random(42)) is l", False),
+						("l == _.shuffle([1, 2, 3, 4, 5, 6], rng = random.Random(42))", False)
+					]
 			)
 		]
 	),
@@ -409,7 +623,27 @@ _tests = [
 					"(random sample of length 3 [1,2,3,4,5])",
 					[],
 					"_.sample([1, 2, 3, 4, 5, 6], 3)"
-			)
+			),
+			OneTest(
+					"reproducible sample of a generator",
+					"3\nTrue",
+					[],
+					[
+						("s = _.sample((x for x in range(0, 1000)), 3, rng = random.Random(42))", True),
+						("len(s)", False),
+						("s == _.sample((x for x in range(0, 1000)), 3, rng = random.Random(42))", False)
+					]
+			),
+			OneTest(
+					"sample of an index",
+					"True\n2",
+					[stooges],
+					[
+						("st = Index(stooges, 'age')", True),
+						("_.sample(st) in stooges", False),
+						("len(_.sample(st, 2))", False)
+					]
+			),
 		]
 	),
 	(
@@ -523,6 +757,52 @@ _tests = [
 					[],
 					"_.flatten([1, [2], [3, [[4]]]], shallow = True)"
 			),
+			OneTest(
+					"Flatten two levels",
+					"[1, 2, 3, [4]]",
+					[],
+					"_.flatten([1, [2], [3, [[4]]]], depth = 2)"
+			),
+			OneTest(
+					"Flatten lists and tuples",
+					"[1, 2, 3, 4, 5]",
+					[],
+					"_.flatten([1, (2, 3), [4, (5,)]], containers = (list, tuple))"
+			),
+			OneTest(
+					"Flatten deeper than the recursion limit",
+					"100000",
+					[],
+					[
+						("deep = reduce(lambda a, i: [i, a], range(0, 99999), [99999])", True),
+						("len(_.flatten(deep))", False)
+					]
+			),
+		]
+	),
+	(
+		"flattenIter",
+		[
+			OneTest(
+					"Flatten a stream",
+					"[1, 2, 3, 4]",
+					[],
+					"list(_.flattenIter(iter([1, [2], [3, [[4]]]])))"
+			),
+			OneTest(
+					"Strings are not flattened",
+					"['ab', 'c', 'd']",
+					[],
+					"list(_.flattenIter(['ab', ['c', ('d',)]], containers = (list, tuple, str)))"
+			),
+			OneTest(
+					"Not an iterable",
+					"argument must be Iterable",
+					[],
+					[
+						("try:\n\t_.flattenIter(5)\nexcept TypeError as e:\n\tprint(e)", True)
+					]
+			),
 		]
 	),
 	(
@@ -545,6 +825,12 @@ _tests = [
 					[],
 					"_.union([1, 2, 3], [101, 2, 1, 10], [2, 1])"
 			),
+			OneTest(
+					"Union of arrays with unhashable elements",
+					"[1, [2], {'a': 3}, 4]",
+					[],
+					"_.union([1, [2]], [[2], {'a': 3}], [{'a': 3}, 4, 1])"
+			),
 		]
 	),
 	(
@@ -562,6 +848,12 @@ _tests = [
 					[],
 					"_.intersection([1, 2, 3], [101, 2, 1, 10], [2])"
 			),
+			OneTest(
+					"Intersection of arrays with unhashable elements",
+					"[[2], 3]",
+					[],
+					"_.intersection([1, [2], 3], [[2], 3, {'a': 1}], [3, [2]])"
+			),
 		]
 	),
 	(
@@ -579,6 +871,12 @@ _tests = [
 					[],
 					"_.difference([1, 2, 3, 4, 5], [5, 2, 10], [1])"
 			),
+			OneTest(
+					"Difference of arrays with unhashable elements",
+					"[1, {'a': 3}]",
+					[],
+					"_.difference([1, [2], {'a': 3}, 4], [[2], 4])"
+			),
 		]
 	),
 	(
@@ -602,6 +900,31 @@ _tests = [
 					[],
 					"_.uniq([1.5, 1.7, 2.0, 2.5, 2.5, 3.0, 4.0], iteratee = math.floor)"
 			),
+			OneTest(
+					"Duplicate free version of array with unhashable elements",
+					"[[1], 2, [3]]",
+					[],
+					"_.uniq([[1], 2, [1], [3], 2])"
+			),
+		]
+	),
+	(
+		"uniqIter",
+		[
+			OneTest(
+					"Duplicate free stream",
+					"[1, 2, 3, 4]",
+					[],
+					"list(_.uniqIter(iter([1, 2, 1, 3, 1, 4, 2])))"
+			),
+			OneTest(
+					"Not an iterable",
+					"argument must be Iterable",
+					[],
+					[
+						("try:\n\t_.uniqIter(5)\nexcept TypeError as e:\n\tprint(e)", True)
+					]
+			),
 		]
 	),
 	(
@@ -817,6 +1140,16 @@ _tests = [
 						("subFrom20(5)", False)
 					]
 			),
+			OneTest(
+					"placeholders, extra arguments and keywords",
+					"((1, 2, 3, 4), {'x': 1, 'y': 2})",
+					[],
+					[
+						("f = lambda *args, **keywords: (args, dict(sorted(keywords.items())))", True),
+						("g = _.partial(f, None, 2, None, x=1)", True),
+						("g(1, 3, 4, y=2)", False)
+					]
+			),
 		]
 	),
 	(
@@ -856,6 +1189,44 @@ _tests = [
 			),
 		]
 	),
+	(
+		"memoize",
+		[
+			OneTest(
+					"memoized recursion",
+					"23416728348467685\nCacheInfo(hits=78, misses=81, evictions=0, maxsize=None, currsize=81)",
+					[],
+					[
+						("fibonacci = _.memoize(lambda n: n if n < 2 else fibonacci(n - 1) + fibonacci(n - 2))", True),
+						("fibonacci(80)", False),
+						("fibonacci.cache_info()", False),
+					]
+			),
+			OneTest(
+					"least recently used eviction, with a hasher",
+					"['moe', 'larry', 'moe', 'curly', 'larry']\nCacheInfo(hits=1, misses=4, evictions=2, maxsize=2, currsize=2)",
+					[stooges0],
+					[
+						("name = _.memoize(lambda st: st['name'], hasher = lambda st: st['name'], maxsize = 2)", True),
+						("[name(stooges0[i]) for i in [0, 1, 0, 2, 1]]", False),
+						("name.cache_info()", False),
+					]
+			),
+			OneTest(
+					"expired results, name and docstring",
+					"CacheInfo(hits=0, misses=100, evictions=0, maxsize=None, currsize=0)\nisPrime\nTrue",
+					[],
+					[
+						("prime = _.memoize(isPrime, ttl = 0.01)", True),
+						("for i in range(0, 100): prime(i)", True),
+						("time.sleep(0.05)", True),
+						("prime.cache_info()", False),
+						("prime.__name__", False),
+						("prime.__doc__ == isPrime.__doc__", False),
+					]
+			),
+		]
+	),
 	(
 		"once",
 		[
@@ -871,6 +1242,88 @@ _tests = [
 					],
 					True
 			),
+			OneTest(
+					"from several threads",
+					"[0]",
+					[],
+					[
+						("calls = []", True),
+						("initialize = _.once(lambda i: calls.append(i) or time.sleep(0.1))", True),
+						("threads = [threading.Thread(target=initialize, args=(i,)) for i in range(0, 8)]", True),
+						("threads[0].start(); time.sleep(0.05)", True),
+						("for t in threads[1:]: t.start()", True),
+						("for t in threads: t.join()", True),
+						("calls", False)
+					]
+			),
+		]
+	),
+	(
+		"throttle",
+		[
+			OneTest(
+					"leading and trailing calls",
+					"[0, 2]",
+					[],
+					[
+						("calls = []", True),
+						("throttled = _.throttle(calls.append, 0.2)", True),
+						("for i in range(0, 3): throttled(i)", True),
+						("time.sleep(0.4)", True),
+						("calls", False)
+					]
+			),
+			OneTest(
+					"trailing call in a forked process",
+					"2",
+					[],
+					[
+						("_.debounce(len, 0.01)('started the timer thread')", True),
+						("def child():\n\tcalls = []\n\tthrottled = _.throttle(calls.append, 0.1)\n\tfor i in range(0, 3): throttled(i)\n\ttime.sleep(0.3)\n\tos._exit(len(calls))", True),
+						("pid = os.fork()\nif pid == 0:\n\tchild()", True),
+						("os.waitpid(pid, 0)[1] >> 8", False)
+					]
+			),
+			OneTest(
+					"athrottle, leading and trailing calls of a coroutine function",
+					"[0, 2]",
+					[],
+					[
+						("import asyncio", True),
+						("async def record(i):\n\tcalls.append(i)", True),
+						("async def main():\n\tthrottled = _.athrottle(record, 0.1)\n\tfor i in range(0, 3): throttled(i)\n\tawait asyncio.sleep(0.2)", True),
+						("calls = []; asyncio.run(main())", True),
+						("calls", False)
+					]
+			),
+		]
+	),
+	(
+		"debounce",
+		[
+			OneTest(
+					"last call only",
+					"[2]",
+					[],
+					[
+						("calls = []", True),
+						("debounced = _.debounce(calls.append, 0.2)", True),
+						("for i in range(0, 3): debounced(i)", True),
+						("time.sleep(0.4)", True),
+						("calls", False)
+					]
+			),
+			OneTest(
+					"adebounce, last call only, or immediate call",
+					"[2]\n[0, 3]",
+					[],
+					[
+						("import asyncio", True),
+						("async def main(immediate):\n\tcalls = []\n\tdebounced = _.adebounce(calls.append, 0.1, immediate = immediate)\n\tfor i in range(0, 3): debounced(i)\n\tawait asyncio.sleep(0.2)\n\tif immediate: debounced(3)\n\treturn calls", True),
+						("asyncio.run(main(False))", False),
+						("asyncio.run(main(True))", False)
+					]
+			),
 		]
 	),
 	(
@@ -927,6 +1380,33 @@ _tests = [
 						("welcome('moe')", False)
 					]
 			),
+			OneTest(
+					"nested compositions",
+					"[14, 5]",
+					[],
+					[
+						("inc = lambda x: x + 1", True),
+						("double = lambda x: x * 2", True),
+						("f = _.compose(double, _.compose(inc, double), _.pipe(inc, inc))", True),
+						("[f(1), len(f._underscore_stages)]", False)
+					]
+			),
+		]
+	),
+	(
+		"pipe",
+		[
+			OneTest(
+					"pipeline of greeting",
+					"HI: MOE!",
+					[],
+					[
+						("greet    = lambda name: 'hi: ' + name", True),
+						("exclaim  = lambda statement: statement.upper() + '!'", True),
+						("welcome  = _.pipe(greet, exclaim)", True),
+						("welcome('moe')", False)
+					]
+			),
 		]
 	),
 	(
@@ -1186,6 +1666,36 @@ _tests = [
 						("checkAge(stooges[2])", False),
 					]
 			),
+			OneTest(
+					"compiled predicates on several keys",
+					"[True, False, False, False]\nTrue",
+					[listOfPlays],
+					[
+						("check = _.matcher({'author': 'Shakespeare', 'year': 1611})", True),
+						("_.map([listOfPlays[0], listOfPlays[2], {'author': 'Shakespeare'}, 1611], check)", False),
+						("check is _.matcher({'year': 1611, 'author': 'Shakespeare'})", False),
+					]
+			),
+			OneTest(
+					"mappings which are not dictionaries",
+					"True\n[mappingproxy({'name': 'moe', 'age': 40})]",
+					[],
+					[
+						("import types", True),
+						("moe = types.MappingProxyType({'name': 'moe', 'age': 40})", True),
+						("_.matcher({'name': 'moe', 'age': 40})(moe)", False),
+						("_.where([moe, 40], {'age': 40})", False),
+					]
+			),
+			OneTest(
+					"a NaN value does not match itself",
+					"False",
+					[],
+					[
+						("nan = float('nan')", True),
+						("_.matcher({'x': 1, 'y': nan, 'z': 2})({'x': 1, 'y': nan, 'z': 2})", False),
+					]
+			),
 		]
 	),
 	(
@@ -1237,9 +1747,150 @@ _tests = [
 			),
 		]
 	),
+	(
+		"lazy",
+		[
+			OneTest(
+					"lazy map and filter on an infinite stream",
+					"[1, 9, 25]",
+					[],
+					[
+						("import itertools", True),
+						("list(itertools.islice(_.lazy.filter(_.lazy.map(itertools.count(), lambda x: x * x), lambda x: x % 2), 3))", False)
+					]
+			),
+			OneTest(
+					"lazy pluck and compact",
+					"['moe', 'larry']",
+					[stooges],
+					"list(_.lazy.compact(_.lazy.pluck(iter(stooges[0:2]), 'name')))"
+			),
+			OneTest(
+					"lazy zip",
+					"[['moe', 30], ['larry', 40]]",
+					[],
+					"list(_.lazy.zip(iter(['moe', 'larry', 'curly']), iter([30, 40])))"
+			),
+			OneTest(
+					"external sort, in runs of 2 values",
+					"[{'name': 'curly', 'age': 60}, {'name': 'joe', 'age': 60}, {'name': 'larry', 'age': 50}, {'name': 'moe', 'age': 40}]",
+					[stooges],
+					"list(_.lazy.sortBy(iter(stooges), ['-age', 'name'], budget = 2))"
+			),
+			OneTest(
+					"external sort with cascaded merges",
+					"[{'name': 'curly', 'age': 60}, {'name': 'joe', 'age': 60}, {'name': 'larry', 'age': 50}, {'name': 'moe', 'age': 40}]",
+					[stooges],
+					"list(_.lazy.sortBy(iter(stooges), [('age', True)], budget = 1, fanIn = 2))"
+			),
+		]
+	),
+	(
+		"Collection",
+		[
+			OneTest(
+					"columns of a collection",
+					"['author', 'year', 'title']\n[1611, 1611, 1601]",
+					[listOfPlays],
+					[
+						("plays = Collection(listOfPlays)", True),
+						("plays.fields()", False),
+						("plays.column('year')", False)
+					]
+			),
+			OneTest(
+					"where on a collection",
+					"[{'author': 'Shakespeare', 'year': 1611, 'title': 'The tempest'}, {'author': 'Shakespeare', 'year': 1611, 'title': 'Cymbeline'}]",
+					[listOfPlays],
+					"_.where(Collection(listOfPlays), {'author': 'Shakespeare', 'year': 1611}).toList()"
+			),
+			OneTest(
+					"sortBy and pluck on a collection",
+					"['curly', 'larry', 'moe']",
+					[stooges0],
+					"_.pluck(_.sortBy(Collection(stooges0), 'name'), 'name')"
+			),
+			OneTest(
+					"groupBy and countBy on a collection",
+					"[{'name': 'curly', 'age': 60}, {'name': 'joe', 'age': 60}]\n{40: 1, 50: 1, 60: 2}",
+					[stooges],
+					[
+						("st = Collection(stooges)", True),
+						("_.groupBy(st, 'age')[60].toList()", False),
+						("_.countBy(st, 'age')", False)
+					]
+			),
+			OneTest(
+					"builtin and itemgetter keys on a collection",
+					"['curly', 'larry', 'moe']\n{2: 3}",
+					[stooges0],
+					[
+						("st = Collection(stooges0)", True),
+						("_.pluck(_.sortBy(st, operator.itemgetter('name')), 'name')", False),
+						("_.countBy(st, len)", False)
+					]
+			),
+			OneTest(
+					"missing properties in a collection",
+					"[1, None]\n'b'",
+					[],
+					[
+						("c = Collection([{'a': 1, 'b': 1}, {'a': 2}])", True),
+						("c.column('b')", False),
+						("try:\n\t_.countBy(c, 'b')\nexcept KeyError as e:\n\tprint(repr(e.args[0]))", True)
+					]
+			),
+		]
+	),
+	(
+		"Index",
+		[
+			OneTest(
+					"where and findWhere on an index",
+					"{'author': 'Shakespeare', 'year': 1611, 'title': 'Cymbeline'}\n[{'author': 'Shakespeare', 'year': 1611, 'title': 'The tempest'}, {'author': 'Shakespeare', 'year': 1611, 'title': 'Cymbeline'}]",
+					[listOfPlays],
+					[
+						("plays = Index(listOfPlays, 'title', ('author', 'year'))", True),
+						("_.findWhere(plays, {'title': 'Cymbeline'})", False),
+						("_.where(plays, {'author': 'Shakespeare', 'year': 1611})", False)
+					]
+			),
+			OneTest(
+					"filter with a matcher on an updated index",
+					"[{'name': 'curly', 'age': 60}, {'name': 'shemp', 'age': 60}]",
+					[stooges0],
+					[
+						("st = Index(list(stooges0), 'age')", True),
+						("st.append({'name': 'shemp', 'age': 60})", True),
+						("st.remove(st[0])", True),
+						("_.filter(st, _.matcher({'age': 60}))", False)
+					]
+			),
+			OneTest(
+					"other methods on an index",
+					"['moe', 'larry', 'curly']\n{'name': 'moe', 'age': 40}\nargument must be a list",
+					[stooges0],
+					[
+						("st = Index(stooges0, 'age')", True),
+						("_.map(st, lambda s: s['name'])", False),
+						("_.first(st.list)", False),
+						("try:\n\t_.first(st)\nexcept TypeError as e:\n\tprint(e)", True)
+					]
+			),
+		]
+	),
 	(
 		"chaining",
 		[
+			OneTest(
+					"chain with a pool of processes",
+					"[2, 3, 5, 7]\n[0, 1, 4, 6, 8, 9]",
+					[],
+					[
+						("_.chain(_.range(10)).filter(isPrime, workers = 2).value()", False),
+						("_.chain(_.range(10)).reject(isPrime, workers = 2, chunksize = 3).map(lambda x: x).value()", False)
+					]
+			),
 			OneTest(
 					"simple chain 1",
 					"moe is 40",
@@ -1261,6 +1912,27 @@ _tests = [
 						("_.chain([1, 2, 3, 200]).filter(lambda num, *args: num % 2 == 0).tap(pr).map(lambda x, *args: x*x).value()", False)
 					]
 			),
+			OneTest(
+					"fused chain, stopping after the first few elements",
+					"[0, 9, 36]",
+					[],
+					"_.chain(_.range(1000000)).map(lambda x, *args: x*x).filter(lambda x: x % 3 == 0).first(3).value()"
+			),
+			OneTest(
+					"fused chain, single pass until found",
+					"map 1\nmap 2\n4",
+					[],
+					[
+						("pr = lambda x, *args: print('map %s' % x) or 2*x", True),
+						("_.chain([1, 2, 3, 4]).map(pr).find(lambda x: x == 4).value()", False)
+					]
+			),
+			OneTest(
+					"fused chain on a dictionary, followed by a non fused step",
+					"[4, 8, 12]",
+					[],
+					"_.chain({'one': 1, 'two': 2, 'three': 3}).map(lambda val, key, *args: val * 4).sortBy().value()"
+			),
 		]
 	),
 	(
@@ -1289,6 +1961,88 @@ _tests = [
 		]
 	),
 ]
+# NumPy is optional; the tests of the NumPy arrays are run only if it is available
+try:
+	import numpy
+	_tests.append(
+		(
+			"numpy",
+			[
+				OneTest(
+						"max and min of an array",
+						"6\n1",
+						[],
+						[
+							("a = numpy.array([3, 1, 6, 2])", True),
+							("_.max(a)", False),
+							("_.min(a)", False)
+						]
+				),
+				OneTest(
+						"sort an array with a ufunc",
+						"[5 4 6 3 1 2]",
+						[],
+						"_.sortBy(numpy.array([1, 2, 3, 4, 5, 6]), numpy.sin)"
+				),
+				OneTest(
+						"filter an array with a vectorized predicate",
+						"[0 2 4 6]",
+						[],
+						"_.filter(numpy.arange(0, 7), _.vectorized(lambda a: a % 2 == 0))"
+				),
+				OneTest(
+						"sample of an array",
+						"[True, True]",
+						[],
+						"[bool(0 <= x < 10) for x in _.sample(numpy.arange(0, 10), 2)]"
+				),
+				OneTest(
+						"filter an array with a vectorized predicate, in a chain",
+						"[0 2 4 6]",
+						[],
+						"_.chain(numpy.arange(0, 7)).filter(_.vectorized(lambda a: a % 2 == 0)).value()"
+				),
+				OneTest(
+						"the marked function itself is left unchanged",
+						"False\n[2]",
+						[],
+						[
+							("even = lambda a: a % 2 == 0", True),
+							("marked = _.vectorized(even)", True),
+							("hasattr(even, '_underscore_vectorized')", False),
+							("_.filter([1, 2, 3], even)", False)
+						]
+				),
+				OneTest(
+						"count the values of an array",
+						"{1: 2, 2: 1, 3: 3}",
+						[],
+						"_.countBy(numpy.array([3, 1, 2, 3, 1, 3]))"
+				),
+				OneTest(
+						"compact an array",
+						"[1. 2. 3.]",
+						[],
+						"_.compact(numpy.array([0, 1, float('nan'), 2, 0, 3]))"
+				),
+				OneTest(
+						"sorted index in an array",
+						"3",
+						[],
+						"_.sortedIndex(numpy.array([10, 20, 30, 40, 50]), 35)"
+				),
+				OneTest(
+						"range as an array",
+						"[0.   0.25 0.5  0.75]",
+						[],
+						"_.range(0, 1, 0.25, asarray = True)"
+				),
+			]
+		)
+	)
+except ImportError:
+	pass
+
 AllTests = OrderedDict(_tests)
 
 def run_tests(argv):
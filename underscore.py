@@ -1,6 +1,7 @@
 #!/usr/bin/env python
 # coding=utf-8
 from __future__ import print_function
+import os
 import sys
 
 # Tricks to handle Python3
@@ -13,10 +14,32 @@ import itertools
 import random
 import math
 import bisect
+import heapq
+import inspect
+import operator
+import functools
+import pickle
+import tempfile
+import threading
+import time
+import traceback
 from functools import reduce
-from collections import Iterable
+from collections import OrderedDict, Counter, deque, namedtuple
+try:
+	from collections.abc import Iterable, Mapping, Sequence
+except ImportError:
+	from collections import Iterable, Mapping, Sequence
 
-__version__ = 2.0
+__version__ = 2.1
+
+class IterateeErrors(Exception):
+	"""
+    Raised by the methods calling an iteratee concurrently (e.g., :py:meth:`underscore.mapThreaded`) when some of the calls raised an exception. All calls are run to completion first; **errors** is the list of ``(position, exception)`` pairs of the failed calls (the position being that of the value in the input), and **results** is the list of the results of the successful ones.
+    """
+	def __init__(self, errors, results):
+		Exception.__init__(self, "%d iteratee call(s) failed: %s" % (len(errors), errors[0][1] if len(errors) == 1 else [e for (p, e) in errors]))
+		self.errors  = errors
+		self.results = results
 
 # noinspection PyCallByClass,PyShadowingBuiltins,PyPep8,PyPep8,PyPep8
 class underscore(object):
@@ -84,50 +107,270 @@ class underscore(object):
 
         lambda name, *args: ...
 
-    is sometimes used.
+    is sometimes used. Note that :py:meth:`each`, :py:meth:`map`, and :py:meth:`reduce` check how many positional arguments their **iteratee** accepts, and call it with those only; i.e., ``lambda name: ...`` can also be used with these methods.
     """
 
+	# The shape of an iteratee (property name, function with a context, plain function) is resolved once per call of a
+	# library method; the loops then call the returned callable directly, without any further test per element.
 	@staticmethod
-	def _exec1(f, context, a1):
+	def _iteratee1(f, context):
 		if isinstance(f, basestring):
-			return a1[f]
+			return operator.itemgetter(f)
 		elif context is None:
-			return f(a1)
+			return f
+		else:
+			return functools.partial(f, context)
+
+	@staticmethod
+	def _key(f, context):
+		# The keys of the grouping methods: as for _iteratee1, but None is the identity, and a list (or tuple) of property
+		# names gives the tuple of their values
+		if f is None:
+			return underscore.identity
+		elif isinstance(f, (list, tuple)):
+			if len(f) == 1:
+				name = f[0]
+				return lambda x: (x[name],)
+			return operator.itemgetter(*f)
 		else:
-			return f(context, a1)
+			return underscore._iteratee1(f, context)
+
+	@staticmethod
+	def _iteratee(f, context):
+		return f if context is None else functools.partial(f, context)
+
+	# Number of positional arguments of a function, keyed by its code object (all lambdas created by the same
+	# source share it), for the last 256 code objects. None means 'unknown', or that the function has a ``*args``
+	# argument. The arguments with a default value are not counted.
+	_arities     = OrderedDict()
+	_aritiesSize = 256
 
 	@staticmethod
-	def _exec2(f, context, a1, a2):
-		if context is None:
-			return f(a1, a2)
+	def _arity(f):
+		if getattr(f, '_underscore_vectorized', False) is True:
+			f = f.__wrapped__
+		func = getattr(f, '__func__', f)
+		code = getattr(func, '__code__', None)
+		if code is None:
+			return None
+		cache = underscore._arities
+		try:
+			arity = cache.pop(code)
+		except KeyError:
+			arity = None if code.co_flags & inspect.CO_VARARGS else code.co_argcount
+		# (re)inserted as the most recently used one
+		cache[code] = arity
+		if len(cache) > underscore._aritiesSize:
+			try:
+				cache.popitem(last = False)
+			except KeyError:
+				# emptied by another thread
+				pass
+		if arity is None:
+			return None
+		arity -= len(getattr(func, '__defaults__', None) or ())
+		if getattr(f, '__self__', None) is not None:
+			# bound method, 'self' is provided by Python
+			arity -= 1
+		return arity
+
+	@staticmethod
+	def _iteratee_n(f, context, n):
+		# Returns the resolved iteratee and the number of arguments (at most n) it should be called with
+		arity = underscore._arity(f)
+		if arity is not None and context is not None:
+			arity -= 1
+		return underscore._iteratee(f, context), (n if arity is None or arity > n else arity)
+
+	# NumPy is an optional dependency. An array can only be passed to a method if numpy has already been imported by
+	# the caller: the module is looked up, but never imported, to test whether the argument is an array.
+	@staticmethod
+	def _numpy(lst):
+		np = sys.modules.get('numpy')
+		return np if np is not None and isinstance(lst, np.ndarray) and lst.ndim == 1 else None
+
+	@staticmethod
+	def _vectorizable(np, f, context):
+		# True if f can be applied to a full array, instead of each of its elements
+		return context is None and (isinstance(f, np.ufunc) or getattr(f, '_underscore_vectorized', False) is True)
+
+	# The predicates of matcher, where, findWhere, and isMatch are compiled once per set of properties: the first
+	# property is tested by a dict.get, and the others (if the first one matches) by a single (C level) itemgetter call
+	# and tuple comparison. Other mappings are tested key by key. The last compiled predicates are kept, keyed by the
+	# frozen set of properties; properties with unhashable values are compiled for each call.
+	_matchers     = OrderedDict()
+	_matchersSize = 256
+
+	@staticmethod
+	def _compile_matcher(attrs):
+		attrs = dict(attrs)
+		keys  = list(attrs.keys())
+		def other(obj):
+			# the mappings which are not dictionaries
+			if not isinstance(obj, Mapping):
+				return False
+			for k in keys:
+				if k not in obj or obj[k] != attrs[k]:
+					return False
+			return True
+		if len(keys) == 0:
+			func  = lambda obj: isinstance(obj, dict) or other(obj)
+			first = None
 		else:
-			return f(context, a1, a2)
+			key, value, rest = keys[0], attrs[keys[0]], keys[1:]
+			if len(rest) == 0:
+				test = None
+				func = lambda obj: obj.get(key, _missing) == value if isinstance(obj, dict) else other(obj)
+			else:
+				getter = operator.itemgetter(*rest)
+				values = getter(attrs)
+				# the comparison of tuples takes identical values as equal, i.e., a NaN would match itself: the values
+				# which are not equal to themselves are compared key by key
+				compiled = not any((attrs[k] != attrs[k]) is True for k in rest)
+				def test(obj):
+					# the other properties of a dictionary whose first property matches
+					if compiled and type(obj) is dict:
+						try:
+							return getter(obj) == values
+						except KeyError:
+							return False
+					# (subclasses, e.g. defaultdict, may have a __getitem__ with side effects)
+					for k in rest:
+						if k not in obj or obj[k] != attrs[k]:
+							return False
+					return True
+				func = lambda obj: obj.get(key, _missing) == value and test(obj) if isinstance(obj, dict) else other(obj)
+			first = (key, value, test, other)
+		# used by filter and find to query an Index
+		func._underscore_attrs = attrs
+		func._underscore_first = first
+		return func
 
 	@staticmethod
-	def _exec3(f, context, a1, a2, a3):
-		if context is None:
-			return f(a1, a2, a3)
+	def _matching(lst, properties):
+		# The elements of lst matching properties, as an iterator; the test of the first property is inlined
+		func = underscore._matcher(properties)
+		if func._underscore_first is None:
+			return (x for x in lst if func(x))
+		(key, value, test, other) = func._underscore_first
+		if test is None:
+			return (x for x in lst if (x.get(key, _missing) == value if isinstance(x, dict) else other(x)))
+		return (x for x in lst if (x.get(key, _missing) == value and test(x) if isinstance(x, dict) else other(x)))
+
+	@staticmethod
+	def _matcher(attrs):
+		try:
+			key = frozenset(attrs.items())
+		except TypeError:
+			return underscore._compile_matcher(attrs)
+		cache = underscore._matchers
+		try:
+			func = cache.pop(key)
+		except KeyError:
+			func = underscore._compile_matcher(attrs)
+		# (re)inserted as the most recently used one
+		cache[key] = func
+		if len(cache) > underscore._matchersSize:
+			try:
+				cache.popitem(last = False)
+			except KeyError:
+				# emptied by another thread
+				pass
+		return func
+
+	# Parallel execution of the element-wise methods: the values are cut into chunks, and each chunk is processed
+	# by _run_chunk via an executor (by default a pool of processes). The results are collected in the order of
+	# the chunks, i.e., the order of the values is kept.
+	@staticmethod
+	def _run_chunk(kind, func, n, values, indices, lst):
+		if kind == "filter":
+			return [True if func(x) else False for x in values]
+		elif kind == "times":
+			return [func(i) for i in values]
+		if n <= 1:
+			retval = [func(x) for x in values]
+		else:
+			indices = itertools.repeat(None) if indices is None else indices
+			if n == 2:
+				retval = [func(x, i) for (x, i) in zip(values, indices)]
+			else:
+				retval = [func(x, i, lst) for (x, i) in zip(values, indices)]
+		return retval if kind == "map" else []
+
+	@staticmethod
+	def _parallel(kind, func, n, values, indices, lst, workers, executor, chunksize):
+		if chunksize is None:
+			import multiprocessing
+			# a few chunks per worker, to even out the differences among the chunks
+			count     = 4 * (workers if workers is not None else multiprocessing.cpu_count())
+			chunksize = max(1, (len(values) + count - 1) // count)
+
+		def run(ex):
+			futures = [ex.submit(underscore._run_chunk, kind, func, n, values[i:i + chunksize],
+								 None if indices is None else indices[i:i + chunksize], lst)
+					   for i in range(0, len(values), chunksize)]
+			return [r for future in futures for r in future.result()]
+
+		if executor is None:
+			from concurrent.futures import ProcessPoolExecutor
+			with ProcessPoolExecutor(max_workers=workers) as ex:
+				return run(ex)
 		else:
-			return f(context, a1, a2, a3)
+			return run(executor)
 
 	@staticmethod
-	def _exec4(f, context, a1, a2, a3, a4):
-		if context is None:
-			return f(a1, a2, a3, a4)
+	def _parallel_map(kind, lst, iteratee, context, workers, executor, chunksize):
+		func, n = underscore._iteratee_n(iteratee, context, 3)
+		if isinstance(lst, list):
+			values, indices, whole = lst, range(0, len(lst)), lst
+		elif isinstance(lst, dict):
+			indices = list(lst.keys())
+			values, whole = [lst[key] for key in indices], lst
 		else:
-			return f(context, a1, a2, a3, a4)
+			values, indices, whole = list(lst), None, None
+		# the full list is sent to the workers only if the iteratee makes use of it
+		return underscore._parallel(kind, func, n, values, indices, whole if n > 2 else None, workers, executor, chunksize)
 
 	@staticmethod
-	def _extends(obj, ext):
-		if isinstance(obj, dict) and isinstance(ext, dict):
-			for key in ext:
-				if key not in obj or obj[key] != ext[key]:
-					return False
-			return True
-		return False
+	def _threaded(lst, iteratee, context, workers, executor, ordered):
+		# Each call of the iteratee is a separate task of a thread pool: meant for iteratees that wait (I/O, etc.)
+		from concurrent.futures import ThreadPoolExecutor, as_completed
+		func, n = underscore._iteratee_n(iteratee, context, 3)
+		if isinstance(lst, list):
+			items = enumerate(lst)
+		elif isinstance(lst, dict):
+			items = ((key, lst[key]) for key in lst)
+		else:
+			items = ((None, x) for x in lst)
+		whole = lst if isinstance(lst, (list, dict)) else None
+
+		def run(ex):
+			if n <= 1:
+				futures = [ex.submit(func, x) for (i, x) in items]
+			elif n == 2:
+				futures = [ex.submit(func, x, i) for (i, x) in items]
+			else:
+				futures = [ex.submit(func, x, i, whole) for (i, x) in items]
+			positions = {future: p for (p, future) in enumerate(futures)}
+			retval = []
+			errors = []
+			for future in (futures if ordered else as_completed(futures)):
+				try:
+					retval.append(future.result())
+				except Exception as e:
+					errors.append((positions[future], e))
+			if len(errors) != 0:
+				raise IterateeErrors(sorted(errors, key=lambda e: e[0]), retval)
+			return retval
+
+		if executor is None:
+			with ThreadPoolExecutor(max_workers=workers) as ex:
+				return run(ex)
+		else:
+			return run(executor)
 
 	@staticmethod
-	def each(lst, iteratee, context = None):
+	def each(lst, iteratee, context = None, workers = None, executor = None, chunksize = None):
 		"""
         **Aliases**:
             :py:meth:`each`, :py:meth:`forEach`
@@ -136,6 +379,7 @@ class underscore(object):
         Each invocation of **iteratee** is called with three arguments: if **lst** is of list type,
         then the arguments are ``(element, index, list)``; if it is of dictionary type
         the arguments are ``(value, key, list``). Returns **lst** for possible chaining.
+        If **iteratee** accepts fewer positional arguments (e.g., ``lambda x: ...``), it is called with the first ones only.
 
         The method also works for an arbitrary iterator; however, in that case the **iteratee** is invoked
         with ``None`` for the second and third
@@ -150,31 +394,51 @@ class underscore(object):
             33
             22
             11
+
+        The **workers**, **executor**, and **chunksize** arguments can be used to run the **iteratee** in parallel, see :py:meth:`map`.
         """
 		if iteratee is None:
 			return lst
+		elif workers is not None or executor is not None:
+			underscore._parallel_map("each", lst, iteratee, context, workers, executor, chunksize)
+			return lst if isinstance(lst, (list, dict)) else None
+		func, n = underscore._iteratee_n(iteratee, context, 3)
+		if n <= 1:
+			for value in (lst.values() if isinstance(lst, dict) else lst):
+				func(value)
 		elif isinstance(lst, list):
-			for i in range(0, len(lst)):
-				underscore._exec3(iteratee, context, lst[i], i, lst)
-			return lst
+			if n == 2:
+				for (i, x) in enumerate(lst):
+					func(x, i)
+			else:
+				for (i, x) in enumerate(lst):
+					func(x, i, lst)
 		elif isinstance(lst, dict):
-			for key in lst:
-				underscore._exec3(iteratee, context, lst[key], key, lst)
-			return lst
+			if n == 2:
+				for key in lst:
+					func(lst[key], key)
+			else:
+				for key in lst:
+					func(lst[key], key, lst)
 		else:
-			for value in lst:
-				underscore._exec3(iteratee, context, value, None, None)
-			return None
+			if n == 2:
+				for value in lst:
+					func(value, None)
+			else:
+				for value in lst:
+					func(value, None, None)
+		return lst if isinstance(lst, (list, dict)) else None
 
 	@staticmethod
-	def map(lst, iteratee = None, context = None):
+	def map(lst, iteratee = None, context = None, workers = None, executor = None, chunksize = None):
 		"""
         **Aliases**:
             :py:meth:`map`, :py:meth:`collect`
 
         Produces a *new* array of values by mapping each value in **lst** through a transformation
         function (**iteratee**). Similarly to :py:meth:`each`, the **iteratee** is passed three arguments:
-        the ``value``, then the ``index`` (or ``key``) of the iteration, and finally a reference to the entire list.
+        the ``value``, then the ``index`` (or ``key``) of the iteration, and finally a reference to the entire list
+        (or only the first ones, if **iteratee** accepts fewer positional arguments).
 
         The method also works for an arbitrary iterator; however, in that case the **iteratee** is invoked
         with ``None`` for the second and third argument.
@@ -186,15 +450,76 @@ class underscore(object):
             [12, 8, 4]
             >>> _.map([[1, 2], [3, 4]], lambda a, *args: _.first(a))
             [1, 3]
+
+        If **workers** is set, the values are cut into chunks of **chunksize** elements (by default, a size yielding
+        four chunks per worker), and the chunks are processed in parallel by a pool of **workers** processes. An
+        already running ``concurrent.futures`` **executor** can also be provided instead of creating a new pool.
+        The order of the results is kept. The **iteratee** (and the **context**) must be picklable, i.e., they
+        cannot be lambdas, and their side effects happen in the worker processes. An **iteratee** that makes use
+        of the list argument gets a copy of the full list with each chunk, which is costly: one or two argument
+        functions should be preferred.
+
+            >>> _.map(_.range(1000000), isPrime, workers = 8)
+            [False, False, True, True, False, ...]
         """
 		if iteratee is None:
 			return lst
+		elif workers is not None or executor is not None:
+			return underscore._parallel_map("map", lst, iteratee, context, workers, executor, chunksize)
+		func, n = underscore._iteratee_n(iteratee, context, 3)
+		if n <= 1:
+			return [func(value) for value in (lst.values() if isinstance(lst, dict) else lst)]
 		elif isinstance(lst, list):
-			return [underscore._exec3(iteratee, context, lst[i], i, lst) for i in range(0, len(lst))]
+			return [func(x, i) for (i, x) in enumerate(lst)] if n == 2 else [func(x, i, lst) for (i, x) in enumerate(lst)]
 		elif isinstance(lst, dict):
-			return [underscore._exec3(iteratee, context, lst[key], key, lst) for key in lst]
+			return [func(lst[key], key) for key in lst] if n == 2 else [func(lst[key], key, lst) for key in lst]
 		else:
-			return [underscore._exec3(iteratee, context, value, None, None) for value in lst]
+			return [func(value, None) for value in lst] if n == 2 else [func(value, None, None) for value in lst]
+
+	@staticmethod
+	def eachThreaded(lst, iteratee, context = None, workers = None, executor = None):
+		"""
+        Like :py:meth:`each`, but each call of **iteratee** is run in a pool of threads; see :py:meth:`mapThreaded`. Returns **lst** (or ``None`` for an arbitrary iterator) once all calls are done.
+        """
+		underscore._threaded(lst, iteratee, context, workers, executor, True)
+		return lst if isinstance(lst, (list, dict)) else None
+
+	@staticmethod
+	def mapThreaded(lst, iteratee, context = None, workers = None, executor = None, ordered = True):
+		"""
+        Like :py:meth:`map`, but each call of **iteratee** is run in a pool of threads, at most **workers** at a time (``None`` meaning the default of Python's ``ThreadPoolExecutor``). An already running ``concurrent.futures`` **executor** can also be provided instead of creating a new pool. This is meant for iteratees that spend their time waiting (reading files, calling a subprocess or a database, etc.): the waits overlap.
+
+        If **ordered** is ``True`` the results are in the order of **lst**, otherwise in the order in which the calls completed. If some calls raise an exception, the other calls are still run; an :py:class:`IterateeErrors` exception is raised at the end, listing all the exceptions.
+
+        Example:
+            >>> _.mapThreaded(['a.txt', 'b.txt'], lambda name: open(name).read(), workers = 10)
+            ['content of a', 'content of b']
+        """
+		return underscore._threaded(lst, iteratee, context, workers, executor, ordered)
+
+	@staticmethod
+	def amap(lst, iteratee, context = None, limit = None):
+		"""
+        A coroutine version of :py:meth:`map`, for ``asyncio``. The **iteratee** may be a coroutine function (or, generally, return an awaitable), which is awaited; at most **limit** calls are running concurrently (``None`` meaning no limit). **lst** may also be an asynchronous iterable; in that case (as for any other iterator) the **iteratee** is invoked with ``None`` for the second and third argument. The results are in the order of **lst**. If a call raises an exception, the other calls are cancelled and the exception is propagated.
+
+        The asynchronous methods (:py:meth:`amap`, :py:meth:`aeach`, :py:meth:`afilter`, :py:meth:`afind`, :py:meth:`asome`, :py:meth:`agroupBy`) are only available in Python 3.
+
+        Example:
+            >>> async def fetch(url):
+            ...     (— definition of the function)
+            ...
+            >>> await _.amap(urls, fetch, limit = 10)
+        """
+		import underscore_async
+		return underscore_async.amap(lst, iteratee, context, limit)
+
+	@staticmethod
+	def aeach(lst, iteratee, context = None, limit = None):
+		"""
+        A coroutine version of :py:meth:`each`; see :py:meth:`amap` for the handling of the **iteratee** and of **limit**. The result is **lst** (or ``None`` for an iterator), once all calls are done.
+        """
+		import underscore_async
+		return underscore_async.aeach(lst, iteratee, context, limit)
 
 	@staticmethod
 	def reduce(lst, iteratee, memo = None, context = None):
@@ -205,7 +530,8 @@ class underscore(object):
         Reduce boils down a **lst** of values into a single value that is returned. **memo** is the initial state
         of the reduction, and each successive step of it should be returned by **iteratee**. The **iteratee** is
         passed four arguments: ``memo`` (ie, the current state of reduction), then the ``value`` and ``index``
-        (or ``key``) of the iteration, and finally a reference to the entire list.
+        (or ``key``) of the iteration, and finally a reference to the entire list. If **iteratee** accepts fewer positional
+        arguments (e.g., ``lambda memo, value: ...``), it is called with the first ones only.
 
         If no memo is passed to the initial invocation of reduce, **iteratee** is not invoked on the first element
         of the list. The first element is instead passed as the ``memo`` in the invocation of the **iteratee** on
@@ -222,23 +548,43 @@ class underscore(object):
             >>> _.reduce({'one':1,'two':2,'three':3,'four':4},lambda memo, value, *args: memo*value)
             24
         """
+		func, n = underscore._iteratee_n(iteratee, context, 4)
 		if isinstance(lst, list):
 			if memo is None:
 				if len(lst) == 0:
 					raise IndexError("empty list with no initial value")
 				else :
-					return reduce(lambda m, i: underscore._exec4(iteratee, context, m, lst[i], i, lst), range(1, len(lst)), lst[0])
+					memo  = lst[0]
+					start = 1
+			else:
+				start = 0
+			if n <= 2:
+				for x in itertools.islice(lst, start, None):
+					memo = func(memo, x)
+			elif n == 3:
+				for i in range(start, len(lst)):
+					memo = func(memo, lst[i], i)
 			else:
-				return reduce(lambda m, i: underscore._exec4(iteratee, context, m, lst[i], i, lst), range(0, len(lst)), memo)
+				for i in range(start, len(lst)):
+					memo = func(memo, lst[i], i, lst)
+			return memo
 		elif isinstance(lst, dict):
+			keys = iter(lst)
 			if memo is None:
 				if len(lst) == 0:
 					raise IndexError("empty dict with no initial value")
 				else:
-					keys = list(lst.keys()) if PY3 else lst.keys()
-					return reduce(lambda m, key : underscore._exec4(iteratee, context, m, lst[key], key, lst), keys[1:], lst[keys[0]])
+					memo = lst[next(keys)]
+			if n <= 2:
+				for key in keys:
+					memo = func(memo, lst[key])
+			elif n == 3:
+				for key in keys:
+					memo = func(memo, lst[key], key)
 			else:
-				return reduce(lambda m, key: underscore._exec4(iteratee, context, m, lst[key], key, lst), iter(lst), memo)
+				for key in keys:
+					memo = func(memo, lst[key], key, lst)
+			return memo
 		else:
 			return TypeError("should be a list or a dict")
 
@@ -256,16 +602,19 @@ class underscore(object):
             >>> _.find([1, 2, 3, 4, 5, 6], lambda num: num % 2 == 0)
             2
         """
+		if isinstance(lst, Index) and context is None and isinstance(getattr(predicate, '_underscore_attrs', None), dict):
+			return underscore.findWhere(lst, predicate._underscore_attrs)
 		if isinstance(lst, Iterable):
+			func = underscore._iteratee1(predicate, context)
 			for x in lst:
-				if underscore._exec1(predicate, context, x):
+				if func(x):
 					return x
 			return None
 		else:
 			raise TypeError("argument must be Iterable")
 
 	@staticmethod
-	def filter(lst, predicate, context = None):
+	def filter(lst, predicate, context = None, workers = None, executor = None, chunksize = None):
 		"""
         **Aliases**:
             :py:meth:`filter`, :py:meth:`select`
@@ -276,12 +625,50 @@ class underscore(object):
         Example:
             >>> _.filter([1, 2, 3, 4, 5, 6], lambda num, *args: num % 2 == 0)
             [2, 4, 6]
+
+        If **lst** is a (one dimensional) NumPy array, and the **predicate** is a NumPy ufunc or marked by
+        :py:meth:`vectorized`, the predicate is applied to the full array and the result is an array:
+
+            >>> _.filter(numpy.arange(0, 7), _.vectorized(lambda a: a % 2 == 0))
+            array([0, 2, 4, 6])
+
+        The **workers**, **executor**, and **chunksize** arguments can be used to run the **predicate** in parallel, see :py:meth:`map`.
         """
+		np = underscore._numpy(lst)
+		if np is not None and underscore._vectorizable(np, predicate, context):
+			return lst[np.asarray(predicate(lst), dtype=bool)]
+		if isinstance(lst, Index) and context is None and isinstance(getattr(predicate, '_underscore_attrs', None), dict):
+			return lst._matching(predicate._underscore_attrs)
 		if isinstance(lst, Iterable):
-			return [x for x in lst if underscore._exec1(predicate, context, x)]
+			if workers is not None or executor is not None:
+				values = lst if isinstance(lst, list) else list(lst)
+				func   = underscore._iteratee1(predicate, context)
+				passed = underscore._parallel("filter", func, 1, values, None, None, workers, executor, chunksize)
+				return [x for (x, ok) in zip(values, passed) if ok]
+			func = underscore._iteratee1(predicate, context)
+			return [x for x in lst if func(x)]
 		else:
 			raise TypeError("argument must be Iterable")
 
+	@staticmethod
+	def afilter(lst, predicate, context = None, limit = None):
+		"""
+        A coroutine version of :py:meth:`filter`; see :py:meth:`amap` for the handling of the **predicate** and of **limit**.
+
+        Example:
+            >>> await _.afilter(urls, isReachable, limit = 10)
+        """
+		import underscore_async
+		return underscore_async.afilter(lst, predicate, context, limit)
+
+	@staticmethod
+	def afind(lst, predicate, context = None, limit = None):
+		"""
+        A coroutine version of :py:meth:`find`; see :py:meth:`amap` for the handling of the **predicate** and of **limit**. The result is the first value of **lst** passing the test; as soon as it is known, the calls still running are cancelled, and no new calls are started.
+        """
+		import underscore_async
+		return underscore_async.afind(lst, predicate, context, limit)
+
 	@staticmethod
 	def where(lst, properties):
 		"""
@@ -292,9 +679,17 @@ class underscore(object):
             >>> _.where(listOfPlays, {'author': "Shakespeare", 'year': 1611})
             [{'title': 'The tempest', 'year': 1611, 'author': 'Shakespeare'},
              {'title': 'Cymbeline', 'year': 1611, 'author': 'Shakespeare'}]
+
+        If **lst** is a :py:class:`Collection`, the result is also a :py:class:`Collection`. If **lst** is an :py:class:`Index`, its hash tables are used to find the matching values.
         """
+		if isinstance(lst, Collection):
+			return lst.take(lst._matching(properties))
+		if isinstance(lst, Index):
+			return lst._matching(properties)
 		if isinstance(lst, Iterable):
-			return [x for x in lst if underscore._extends(x, properties)]
+			if not isinstance(properties, dict):
+				return []
+			return list(underscore._matching(lst, properties))
 		else:
 			raise TypeError("argument must be Iterable")
 
@@ -307,26 +702,42 @@ class underscore(object):
         Example:
             >>> _.findWhere(listOfPlays, {'author': "Shakespeare", 'year': 1611})
             {'title': 'The tempest', 'year': 1611, 'author': 'Shakespeare'}
+
+        If **lst** is an :py:class:`Index`, its hash tables are used to find the value.
         """
+		if isinstance(lst, Collection):
+			indices = lst._matching(properties)
+			return lst.row(indices[0]) if len(indices) != 0 else None
+		if isinstance(lst, Index):
+			lst = lst._candidates(properties)
 		if isinstance(lst, Iterable):
-			for x in lst:
-				if underscore._extends(x, properties):
-					return x
+			if not isinstance(properties, dict):
+				return None
+			for x in underscore._matching(lst, properties):
+				return x
 			return None
 		else:
 			raise TypeError("argument must be Iterable")
 
 	@staticmethod
-	def reject(lst, predicate, context = None):
+	def reject(lst, predicate, context = None, workers = None, executor = None, chunksize = None):
 		"""
         Returns the values in **lst** without the elements that the truth test (**predicate**) passes. The opposite of :py:meth:`filter`.
 
         Example:
             >>> _.reject([1, 2, 3, 4, 5, 6], lambda num: num % 2 == 0)
             [1, 3, 5]
+
+        The **workers**, **executor**, and **chunksize** arguments can be used to run the **predicate** in parallel, see :py:meth:`map`.
         """
 		if isinstance(lst, Iterable):
-			return [x for x in lst if not underscore._exec1(predicate, context, x)]
+			if workers is not None or executor is not None:
+				values = lst if isinstance(lst, list) else list(lst)
+				func   = underscore._iteratee1(predicate, context)
+				passed = underscore._parallel("filter", func, 1, values, None, None, workers, executor, chunksize)
+				return [x for (x, ok) in zip(values, passed) if not ok]
+			func = underscore._iteratee1(predicate, context)
+			return [x for x in lst if not func(x)]
 		else:
 			raise TypeError("argument must be Iterable")
 
@@ -340,8 +751,9 @@ class underscore(object):
             False
         """
 		if isinstance(lst, Iterable):
+			func = underscore._iteratee1(predicate, context)
 			for x in lst:
-				if not underscore._exec1(predicate, context, x):
+				if not func(x):
 					return False
 			return True
 		else:
@@ -362,13 +774,22 @@ class underscore(object):
             True
         """
 		if isinstance(lst, Iterable):
+			func = underscore._iteratee1(predicate, context)
 			for x in lst:
-				if underscore._exec1(predicate, context, x):
+				if func(x):
 					return True
 			return False
 		else:
 			raise TypeError("argument must be Iterable")
 
+	@staticmethod
+	def asome(lst, predicate = lambda x: x, context = None, limit = None):
+		"""
+        A coroutine version of :py:meth:`some`; see :py:meth:`amap` for the handling of the **predicate** and of **limit**. As soon as a value passes the test, the calls still running are cancelled, and no new calls are started.
+        """
+		import underscore_async
+		return underscore_async.asome(lst, predicate, context, limit)
+
 	@staticmethod
 	def contains(lst, value):
 		"""
@@ -389,15 +810,20 @@ class underscore(object):
             >>> _.pluck(stooges, 'name')
             ['moe', 'larry', 'curly']
         """
+		if isinstance(lst, Collection):
+			return list(lst._values(propertyName))
 		return [l[propertyName] for l in lst]
 
 	@staticmethod
-	def max(lst, iteratee = None, context = None):
+	def max(lst, iteratee = None, context = None, n = None):
 		"""
         Returns the maximum value in **lst**. If an **iteratee** function is provided,
         it will be used on each value to generate the criterion by which the value is ranked.
         ``float("inf")`` is returned if list is empty.
 
+        If **lst** is a (one dimensional) NumPy array, the array's ``max`` is used, or, if the **iteratee** is a
+        NumPy ufunc or has been marked by :py:meth:`vectorized`, ``argmax`` on the iteratee applied to the full array.
+
         Example:
             >>> _.max([1,2,3,4])"
             4
@@ -407,24 +833,39 @@ class underscore(object):
             inf
             >>> .max(stooges0, lambda stooge: stooge['age'])
             {'name': 'curly', 'age': 60}
+
+        If **n** is set, the list of the **n** largest values is returned instead, see :py:meth:`topBy`.
          """
+		if n is not None:
+			return underscore.topBy(lst, n, iteratee, context)
 		if isinstance(lst, Iterable):
 			if lst is None or len(lst) == 0:
 				return float("inf")
+			if isinstance(lst, Collection) and isinstance(iteratee, basestring):
+				column = lst._values(iteratee)
+				return lst.row(max(range(0, len(column)), key=column.__getitem__))
+			np = underscore._numpy(lst)
+			if np is not None:
+				if iteratee is None:
+					return lst.max()
+				elif underscore._vectorizable(np, iteratee, context):
+					return lst[np.argmax(iteratee(lst))]
 			if iteratee is None:
 				return max(lst)
 			else:
-				return max(lst, key=lambda x: underscore._exec1(iteratee, context, x))
+				return max(lst, key=underscore._iteratee1(iteratee, context))
 		else:
 			raise TypeError("argument must be Iterable")
 
 	@staticmethod
-	def min(lst, iteratee = None, context = None):
+	def min(lst, iteratee = None, context = None, n = None):
 		"""
         Returns the min value in **lst**. If an **iteratee** function is provided,
         it will be used on each value to generate the criterion by which the value
         is ranked. ``float("-inf")`` is returned if list is empty, so an guard may be required.
 
+        NumPy arrays are handled the same way as for :py:meth:`max`.
+
         Example:
             >>> _.min([1,2,3,4])"
             1
@@ -434,19 +875,72 @@ class underscore(object):
             -inf
             >>> .min(stooges0, lambda stooge: stooge['age'])
             {'name': 'moe', 'age': 40}
+
+        If **n** is set, the list of the **n** smallest values is returned instead, see :py:meth:`bottomBy`.
         """
+		if n is not None:
+			return underscore.bottomBy(lst, n, iteratee, context)
 		if isinstance(lst, Iterable):
 			if lst is None or len(lst) == 0:
 				return float("-inf")
+			if isinstance(lst, Collection) and isinstance(iteratee, basestring):
+				column = lst._values(iteratee)
+				return lst.row(min(range(0, len(column)), key=column.__getitem__))
+			np = underscore._numpy(lst)
+			if np is not None:
+				if iteratee is None:
+					return lst.min()
+				elif underscore._vectorizable(np, iteratee, context):
+					return lst[np.argmin(iteratee(lst))]
 			if iteratee is None:
 				return min(lst)
 			else:
-				return min(lst, key=lambda x: underscore._exec1(iteratee, context, x))
+				return min(lst, key=underscore._iteratee1(iteratee, context))
 		else:
 			raise TypeError("argument must be Iterable")
 
 	@staticmethod
-	def sortBy(lst, iteratee = None, context = None):
+	def _select(select, lst, n, iteratee, context):
+		if not isinstance(lst, Iterable):
+			raise TypeError("argument must be Iterable")
+		if n <= 0:
+			return lst.take([]) if isinstance(lst, Collection) else []
+		if isinstance(lst, Collection) and isinstance(iteratee, basestring):
+			column = lst._values(iteratee)
+			return lst.take(select(n, range(0, len(column)), key=column.__getitem__))
+		if iteratee is None:
+			return select(n, lst)
+		return select(n, lst, key=underscore._iteratee1(iteratee, context))
+
+	@staticmethod
+	def topBy(lst, n, iteratee = None, context = None):
+		"""
+        Returns the **n** largest values of **lst**, largest first. If an **iteratee** function (or a property name) is
+        provided, it is used on each value to generate the criterion by which the value is ranked; values with the same
+        rank are kept in their order in **lst**. The selection uses a heap of **n** elements, i.e., **lst** is not sorted,
+        and it may be any iterable, e.g., a generator.
+
+        Example:
+            >>> _.topBy(stooges, 2, 'age')
+            [{'name': 'curly', 'age': 60}, {'name': 'joe', 'age': 60}]
+
+        If **lst** is a :py:class:`Collection`, and **iteratee** a property name, the result is also a :py:class:`Collection`.
+        """
+		return underscore._select(heapq.nlargest, lst, n, iteratee, context)
+
+	@staticmethod
+	def bottomBy(lst, n, iteratee = None, context = None):
+		"""
+        Returns the **n** smallest values of **lst**, smallest first; see :py:meth:`topBy`.
+
+        Example:
+            >>> _.bottomBy([5, 3, 8, 1, 9], 2)
+            [1, 3]
+        """
+		return underscore._select(heapq.nsmallest, lst, n, iteratee, context)
+
+	@staticmethod
+	def sortBy(lst, iteratee = None, context = None, inPlace = False):
 		"""
         Returns a sorted copy of **lst**, ranked in ascending order by the results of running each
         value through **iteratee**. **iteratee** may also be the string name of the property.
@@ -456,20 +950,58 @@ class underscore(object):
             [5, 4, 6, 3, 1, 2]
             >>> _.sortBy(stooges0, 'name')
             [{'age': 60, 'name': 'curly'}, {'age': 50, 'name': 'larry'}, {'age': 40, 'name': 'moe'}]
+
+        A property name prefixed by ``'-'`` sorts in descending order. **iteratee** may also be a list of keys: property
+        names (possibly prefixed by ``'-'``), functions, or ``(iteratee, descending)`` pairs, where ``descending`` is a
+        boolean (any other tuple is a composite key, made of the values of its property names, as for :py:meth:`groupBy`);
+        the values are ranked by the first key, then by the second one for equal first keys, etc. The keys of each value are computed only once.
+        The sort is stable, including for the descending keys.
+
+            >>> _.sortBy(stooges, ['-age', 'name'])
+            [{'name': 'curly', 'age': 60}, {'name': 'joe', 'age': 60}, {'name': 'larry', 'age': 50}, {'name': 'moe', 'age': 40}]
+
+        If **inPlace** is ``True``, and **lst** is a list, **lst** itself is sorted and returned, instead of a copy.
+
+        If **lst** is a (one dimensional) NumPy array, and the **iteratee** is missing, a NumPy ufunc, or marked by
+        :py:meth:`vectorized`, the array is sorted by NumPy (with a stable sort), and the result is an array.
         """
-		if iteratee is None:
-			return sorted(lst)
-		elif isinstance(iteratee, basestring):
-			return sorted(lst, key=lambda x: x[iteratee])
-		else:
-			return sorted(lst, key=lambda x: underscore._exec1(iteratee, context, x))
+		np = underscore._numpy(lst)
+		if np is not None:
+			if iteratee is None:
+				return np.sort(lst, kind='stable')
+			elif underscore._vectorizable(np, iteratee, context):
+				return lst[np.argsort(iteratee(lst), kind='stable')]
+		keys = underscore._sortKeys(iteratee)
+		if isinstance(lst, Collection):
+			# the positions of the records are sorted, on the columns
+			indices = list(range(0, len(lst)))
+			for (key, descending) in reversed(keys):
+				indices.sort(key=lst._keys(key, context).__getitem__, reverse=descending)
+			return lst.take(indices)
+		if not isinstance(lst, list) or not inPlace:
+			lst = list(lst)
+		for (key, descending) in reversed(keys):
+			lst.sort(key=None if key is None else underscore._key(key, context), reverse=descending)
+		return lst
+
+	@staticmethod
+	def _sortKeys(iteratee):
+		# The keys of sortBy, as (key, descending) pairs. The list is sorted by each key in turn, starting from the last
+		# one: as the sort is stable, the values are eventually ranked by the first key, then by the second one, etc.;
+		# each key is computed once per value, and compared on its own (which is faster than comparing tuples).
+		retval = []
+		for key in (iteratee if isinstance(iteratee, list) else [iteratee]):
+			if isinstance(key, tuple) and len(key) == 2 and isinstance(key[1], bool):
+				retval.append(key)
+			elif isinstance(key, basestring) and key.startswith('-'):
+				retval.append((key[1:], True))
+			else:
+				retval.append((key, False))
+		return retval
 
 	@staticmethod
 	def _group(lst, iteratee, context):
-		if isinstance(iteratee, basestring):
-			func = lambda x: x[iteratee]
-		else:
-			func = lambda x: underscore._exec1(iteratee, context, x)
+		func = underscore._key(iteratee, context)
 
 		retval = {}
 		for x in lst:
@@ -494,14 +1026,30 @@ class underscore(object):
             >>> st2 = [{'name': 'joe', 'age': 40}, {'name': 'tom', 'age': 50}, {'name': 'bill', 'age': 50}]
             >>> _.groupBy(st2, 'age')
             {40: [{'age': 40, 'name': 'joe'}], 50: [{'age': 50, 'name': 'tom'}, {'age': 50, 'name': 'bill'}]}
+
+        **iteratee** may also be a list of property names, the keys being the tuples of their values (this is also
+        true for :py:meth:`indexBy`, :py:meth:`countBy`, and :py:meth:`aggregateBy`).
+
+        If **lst** is a :py:class:`Collection`, each group is also a :py:class:`Collection`.
         """
+		if isinstance(lst, Collection):
+			grouped = lst._groups(iteratee, context)
+			return {g: lst.take(grouped[g]) for g in grouped}
 		if isinstance(lst, Iterable):
 			return underscore._group(lst, iteratee, context)
 		else:
 			raise TypeError("lst must be iterable")
 
 	@staticmethod
-	def indexBy(lst, iteratee, context = None):
+	def agroupBy(lst, iteratee, context = None, limit = None):
+		"""
+        A coroutine version of :py:meth:`groupBy`; see :py:meth:`amap` for the handling of the **iteratee** and of **limit**.
+        """
+		import underscore_async
+		return underscore_async.agroupBy(lst, iteratee, context, limit)
+
+	@staticmethod
+	def indexBy(lst, iteratee, context = None, last = False):
 		"""
         Given a **lst**, and an **iteratee** function that returns a key for each element in the
         list (or a property name), returns an object with an index of each item. Just
@@ -510,46 +1058,193 @@ class underscore(object):
         Example:
             >>> _.indexBy(stooges0, 'age')
             {40: {'age': 40, 'name': 'moe'}, 50: {'age': 50, 'name': 'larry'}, 60: {'age': 60, 'name': 'curly'}}
+
+        If several elements have the same key, the first one is kept, or the last one if **last** is ``True``. Only one
+        element per key is kept while going through **lst**, which may be any iterable, e.g., a generator.
         """
+		if isinstance(lst, Collection):
+			keys = lst._keys(iteratee, context)
+			if last:
+				positions = dict(zip(keys, range(0, len(keys))))
+			else:
+				positions = {}
+				for (i, key) in enumerate(keys):
+					if key not in positions:
+						positions[key] = i
+			return {k: lst.row(positions[k]) for k in positions}
 		if isinstance(lst, Iterable):
-			grouped = underscore._group(lst, iteratee, context)
-			return {g:grouped[g][0]  for g in grouped}
+			func = underscore._key(iteratee, context)
+			if last:
+				return {func(x): x for x in lst}
+			retval = {}
+			for x in lst:
+				key = func(x)
+				if key not in retval:
+					retval[key] = x
+			return retval
 		else:
 			raise TypeError("lst must be iterable")
 
 	@staticmethod
-	def countBy(lst, iteratee, context = None):
+	def countBy(lst, iteratee = None, context = None):
 		"""
         Sorts a **lst** into groups and returns a count for the number of objects in each group.
         Similar to :py:meth:`groupBy`, but instead of returning a list of values, returns a count for the
-        number of values in that group.
+        number of values in that group. Without an **iteratee**, the values themselves are counted.
 
         Example:
             >>> _.countBy([1, 2, 3, 4, 5], lambda num: 'even' if num % 2 == 0 else 'odd')
             {'even': 2, 'odd': 3}
+
+        The counting is done in a single pass, keeping only the counts: **lst** may be any iterable, e.g., a generator
+        over a large file.
+
+        If **lst** is a (one dimensional) NumPy array, and the **iteratee** is ``None`` (i.e., the values themselves
+        are counted), a NumPy ufunc, or marked by :py:meth:`vectorized`, the counting is done by ``numpy.unique``.
         """
+		np = underscore._numpy(lst)
+		if np is not None and (iteratee is None or underscore._vectorizable(np, iteratee, context)):
+			(keys, counts) = np.unique(lst if iteratee is None else iteratee(lst), return_counts=True)
+			return dict(zip(keys.tolist(), counts.tolist()))
+		if isinstance(lst, Collection):
+			return dict(Counter(lst._keys(iteratee, context)))
 		if isinstance(lst, Iterable):
-			grouped = underscore._group(lst, iteratee, context)
-			return {g: len(grouped[g]) for g in grouped}
+			if iteratee is None:
+				return dict(Counter(lst))
+			func = underscore._key(iteratee, context)
+			return dict(Counter(map(func, lst) if PY3 else itertools.imap(func, lst)))
 		else:
 			raise TypeError("lst must be iterable")
 
 
+	# The aggregates of aggregateBy
+	_aggregates = ('count', 'sum', 'mean', 'min', 'max')
+
+	@staticmethod
+	def aggregateBy(lst, iteratee, aggregates, context = None, records = False):
+		"""
+        Groups **lst** like :py:meth:`groupBy`, and computes several aggregate values for each group, in a single pass
+        over **lst**, without storing the groups. **aggregates** is a dictionary of names and aggregates; an aggregate
+        is ``'count'`` (the number of values in the group), or a ``(function, field)`` tuple, where the function is one of
+        ``'sum'``, ``'mean'``, ``'min'``, ``'max'``, or ``'count'``, and the field is a property name, or a function
+        applied to each value. **iteratee** may also be a list of property names, the key being the tuple of their
+        values. Returns a dictionary of the keys and of the dictionaries of the aggregate values or, if **records** is
+        ``True``, a list of dictionaries with the key (named after the property names, or ``'key'`` if **iteratee** is
+        a function) and the aggregate values.
+
+        Example:
+            >>> _.aggregateBy(listOfPlays, 'author', {'n': 'count', 'first': ('min', 'year'), 'last': ('max', 'year')})
+            {'Shakespeare': {'n': 3, 'first': 1601, 'last': 1611}}
+            >>> _.aggregateBy(listOfPlays, ['author', 'year'], {'n': 'count'}, records = True)
+            [{'author': 'Shakespeare', 'year': 1611, 'n': 2}, {'author': 'Shakespeare', 'year': 1601, 'n': 1}]
+
+        **lst** may be any iterable (e.g., a generator), or a :py:class:`Collection`, in which case the columns are used.
+        """
+		if not isinstance(lst, Iterable):
+			raise TypeError("lst must be iterable")
+		if not isinstance(aggregates, dict):
+			raise TypeError("aggregates must be a dictionary")
+		# the fields, without repetition, and for each aggregate: its name, its function, the position of its field
+		fields = []
+		specs  = []
+		for name in aggregates:
+			spec = aggregates[name]
+			if spec == 'count':
+				spec = ('count', None)
+			if not isinstance(spec, tuple) or len(spec) != 2 or spec[0] not in underscore._aggregates:
+				raise ValueError("unknown aggregate: %r" % (spec,))
+			if spec[0] == 'count':
+				specs.append((name, 'count', None))
+				continue
+			if spec[1] not in fields:
+				fields.append(spec[1])
+			specs.append((name, spec[0], fields.index(spec[1])))
+
+		# (key, values of the fields) pairs
+		if isinstance(lst, Collection):
+			pairs = zip(lst._keys(iteratee, context), zip(*[lst._keys(field, context) for field in fields]) if len(fields) != 0 else itertools.repeat(()))
+		else:
+			func    = underscore._key(iteratee, context)
+			getters = [underscore._iteratee1(field, context) for field in fields]
+			if len(getters) == 0:
+				pairs = ((func(x), ()) for x in lst)
+			elif len(getters) == 1:
+				getter = getters[0]
+				pairs  = ((func(x), (getter(x),)) for x in lst)
+			elif False not in [isinstance(field, basestring) for field in fields]:
+				getter = operator.itemgetter(*fields)
+				pairs  = ((func(x), getter(x)) for x in lst)
+			else:
+				pairs  = ((func(x), tuple(getter(x) for getter in getters)) for x in lst)
+
+		# the state of a group is its size, followed by the running sum, minimum, or maximum of each aggregate (the
+		# minimum and maximum start with the first value of the group)
+		slots  = list(enumerate(specs, 1))
+		sums   = [(slot, k) for (slot, (n, f, k)) in slots if f in ('sum', 'mean')]
+		mins   = [(slot, k) for (slot, (n, f, k)) in slots if f == 'min']
+		maxs   = [(slot, k) for (slot, (n, f, k)) in slots if f == 'max']
+		firsts = mins + maxs
+		groups = OrderedDict()
+		for (key, values) in pairs:
+			try:
+				state = groups[key]
+			except KeyError:
+				state = groups[key] = [0] * (len(specs) + 1)
+				for (slot, k) in firsts:
+					state[slot] = values[k]
+			state[0] += 1
+			for (slot, k) in sums:
+				state[slot] += values[k]
+			for (slot, k) in mins:
+				if values[k] < state[slot]:
+					state[slot] = values[k]
+			for (slot, k) in maxs:
+				if values[k] > state[slot]:
+					state[slot] = values[k]
+
+		retval = OrderedDict()
+		for key in groups:
+			state = groups[key]
+			group = {}
+			for (slot, (n, f, k)) in enumerate(specs, 1):
+				if f == 'count':
+					group[n] = state[0]
+				elif f == 'mean':
+					group[n] = float(state[slot]) / state[0]
+				else:
+					group[n] = state[slot]
+			retval[key] = group
+		if not records:
+			return dict(retval)
+		if isinstance(iteratee, basestring):
+			return [dict([(iteratee, key)] + list(retval[key].items())) for key in retval]
+		elif isinstance(iteratee, (list, tuple)):
+			return [dict(list(zip(iteratee, key)) + list(retval[key].items())) for key in retval]
+		else:
+			return [dict([('key', key)] + list(retval[key].items())) for key in retval]
+
 	@staticmethod
-	def shuffle(lst):
+	def shuffle(lst, inPlace = False, rng = None):
 		"""
         Returns a (randomly) shuffled copy of the **lst**.
 
         Example:
             >>> _.shuffle([1, 2, 3, 4, 5, 6])
             [6, 4, 5, 2, 1, 3]
+
+        If **inPlace** is ``True``, and **lst** is a list, **lst** itself is shuffled and returned. **rng** is the random
+        generator to use, e.g., a ``random.Random(seed)`` instance for reproducible results; by default, the functions
+        of the :py:mod:`random` module are used.
         """
-		indeces = list(range(0, len(lst)))
-		random.shuffle(indeces)
-		return [lst[i] for i in indeces]
+		rng = random if rng is None else rng
+		if not isinstance(lst, list) or not inPlace:
+			lst = list(lst)
+		# Fisher-Yates, on the list itself
+		rng.shuffle(lst)
+		return lst
 
 	@staticmethod
-	def sample(lst, n = None):
+	def sample(lst, n = None, rng = None):
 		"""
         Produce a random sample from the **lst**. Pass a number to return **n** random elements from the list. Otherwise a single random item will be returned.
 
@@ -558,8 +1253,53 @@ class underscore(object):
             1
             >>> _.sample([1, 2, 3, 4, 5, 6], 3)
             [4, 1, 5]
-        """
-		return random.sample(lst, 1)[0] if n is None else random.sample(lst, n)
+
+        **lst** may also be any iterable, e.g., a generator: the sample is then taken in a single pass, keeping only
+        **n** elements in memory (reservoir sampling). **rng** is the random generator to use, see :py:meth:`shuffle`.
+        ``ValueError`` is raised if **lst** has less than **n** elements.
+        """
+		rng = random if rng is None else rng
+		k   = 1 if n is None else n
+		if isinstance(lst, Sequence):
+			retval = rng.sample(lst, k)
+		elif hasattr(lst, '__len__') and hasattr(lst, '__getitem__') and not isinstance(lst, Mapping):
+			# e.g., a NumPy array or an Index, which random.sample does not take: their positions are sampled
+			retval = [lst[i] for i in rng.sample(range(0, len(lst)), k)]
+		else:
+			retval = underscore._reservoir(lst, k, rng)
+		return retval[0] if n is None else retval
+
+	@staticmethod
+	def _reservoir(lst, n, rng):
+		# Algorithm L (Li, 1994): the number of elements to skip before the next replacement in the reservoir is drawn
+		# directly, i.e., the random generator is called O(n log(N/n)) times instead of N times
+		values    = iter(lst)
+		reservoir = list(itertools.islice(values, n))
+		if len(reservoir) < n or n < 0:
+			raise ValueError("sample larger than population or is negative")
+		if n == 0:
+			return reservoir
+		w = math.exp(math.log(underscore._positive(rng)) / n)
+		while True:
+			skip = int(math.floor(math.log(underscore._positive(rng)) / math.log(1 - w)))
+			for x in itertools.islice(values, skip, skip + 1):
+				reservoir[rng.randrange(n)] = x
+				break
+			else:
+				# no more values
+				break
+			w *= math.exp(math.log(underscore._positive(rng)) / n)
+		# the first elements are still in their original order
+		rng.shuffle(reservoir)
+		return reservoir
+
+	@staticmethod
+	def _positive(rng):
+		# A random number in (0, 1)
+		while True:
+			u = rng.random()
+			if u != 0:
+				return u
 
 	@staticmethod
 	def toArray(lst):
@@ -604,8 +1344,9 @@ class underscore(object):
 		yes = []
 		no  = []
 		if isinstance(lst, Iterable):
+			func = underscore._iteratee1(predicate, context)
 			for x in lst:
-				if underscore._exec1(predicate, context, x) is True:
+				if func(x) is True:
 					yes.append(x)
 				else:
 					no.append(x)
@@ -686,37 +1427,78 @@ class underscore(object):
 		"""
         Returns a copy of the **array** with all falsy values removed. ``False``, ``None``, 0, "" (empty string), and ``NaN`` for floats are all falsy.
 
+        The **array** may also be a (one dimensional) NumPy array; the result is then an array, computed with a boolean mask.
+
         Example:
             >>> _.compact([0, 1, False, 2, '', 3, None, 4, float('nan'), 5])
             [1, 2, 3, 4, 5]
         """
+		np = underscore._numpy(array)
+		if np is not None:
+			if array.dtype.kind in 'biufc':
+				mask = array != 0
+				if array.dtype.kind == 'f':
+					mask &= ~np.isnan(array)
+			else:
+				mask = np.array([underscore._falsy(x) is not True for x in array], dtype=bool)
+			return array[mask]
 		if isinstance(array, list):
-			falsy = lambda x: x is None or x is False or x == "" or x == 0 or (type(x) is float and math.isnan(x))
-			return [x for x in array if falsy(x) is not True]
+			return [x for x in array if underscore._falsy(x) is not True]
 		else:
 			raise TypeError("argument must be a list")
 
 	@staticmethod
-	def flatten(array, shallow = False):
-		"""Flattens a nested **array** (the nesting can be to any depth). If you pass **shallow** with value ``True``, the array is only be flattened a single level.
+	def _falsy(x):
+		return x is None or x is False or x == "" or x == 0 or (type(x) is float and math.isnan(x))
+
+	@staticmethod
+	def flatten(array, shallow = False, depth = None, containers = (list,)):
+		"""Flattens a nested **array** (the nesting can be to any depth). If you pass **shallow** with value ``True``, the array is only be flattened a single level; more generally, **depth** sets the number of levels to be flattened (``None`` meaning all). By default only lists are flattened; **containers** may provide a tuple of types to be flattened, e.g., ``(list, tuple, GeneratorType)``; strings are never flattened.
+
+        The nesting is not processed recursively, i.e., it is not restricted by Python's recursion limit.
 
         Example:
             >>> _.flatten([1, [2], [3, [[4]]]])
             [1, 2, 3, 4]
             >>> _.flatten([1, [2], [3, [[4]]]], True)
             [1, 2, 3, [[4]]]
+            >>> _.flatten([1, [2], [3, [[4]]]], depth = 2)
+            [1, 2, 3, [4]]
+            >>> _.flatten([1, (2, 3), [4, (5,)]], containers = (list, tuple))
+            [1, 2, 3, 4, 5]
         """
 		if isinstance(array, list):
-			retval = []
-			for x in array:
-				if type(x) is list:
-					retval +=  x if shallow else underscore.flatten(x)
-				else:
-					retval.append(x)
-			return retval
+			return list(underscore.flattenIter(array, shallow, depth, containers))
 		else:
 			raise TypeError("argument must be a list")
 
+	@staticmethod
+	def flattenIter(lst, shallow = False, depth = None, containers = (list,)):
+		"""Like :py:meth:`flatten`, but works on any iterable **lst** and returns an iterator yielding the elements of the flattened structure one by one, i.e., without creating the full result in memory.
+
+        Example:
+            >>> list(_.flattenIter(iter([1, [2], [3, [[4]]]])))
+            [1, 2, 3, 4]
+        """
+		if not isinstance(lst, Iterable):
+			raise TypeError("argument must be Iterable")
+		return underscore._flattenIter(lst, 1 if shallow else depth, containers)
+
+	@staticmethod
+	def _flattenIter(lst, depth, containers):
+		# The generator of flattenIter, which checks its arguments before the first value is requested. Strings are
+		# never flattened, even if containers includes their type: a string of one character would contain itself.
+		# The stack holds the iterators over the (nested) containers being flattened.
+		stack = [iter(lst)]
+		while len(stack) != 0:
+			for x in stack[-1]:
+				if isinstance(x, containers) and not isinstance(x, (basestring, bytes)) and (depth is None or len(stack) <= depth):
+					stack.append(iter(x))
+					break
+				yield x
+			else:
+				stack.pop()
+
 	@staticmethod
 	def without(array, *values):
 		"""Returns a copy of the **array** with all instances in  ***values** removed.
@@ -730,6 +1512,28 @@ class underscore(object):
 		else:
 			raise TypeError("argument must be a list")
 
+	@staticmethod
+	def _hashed(array):
+		# The set of the hashable elements of array; the unhashable ones are left to _contains
+		try:
+			return set(array)
+		except TypeError:
+			retval = set()
+			for x in array:
+				try:
+					retval.add(x)
+				except TypeError:
+					pass
+			return retval
+
+	@staticmethod
+	def _contains(hashed, array, x):
+		# Equivalent to 'x in array', relying on the set of hashable elements produced by _hashed whenever possible
+		try:
+			return x in hashed
+		except TypeError:
+			return x in array
+
 	@staticmethod
 	def union(*arrays):
 		"""
@@ -751,10 +1555,17 @@ class underscore(object):
 				return [x for x in arrays[0]]
 			else:
 				retval = []
+				seen   = set()
 				for a in arrays:
 					for x in a:
-						if x not in retval:
-							retval.append(x)
+						try:
+							if x not in seen:
+								seen.add(x)
+								retval.append(x)
+						except TypeError:
+							# not hashable, has to be compared to each retained element
+							if x not in retval:
+								retval.append(x)
 				return retval
 
 	@staticmethod
@@ -776,12 +1587,13 @@ class underscore(object):
 			if len(arrays) == 1:
 				return [x for x in arrays[0]]
 			else:
-				curr = arrays[0]
+				curr   = arrays[0]
+				others = [(underscore._hashed(Z), Z) for Z in arrays[1:]]
 				retval = []
 				for x in curr:
 					to_be_added = True
-					for Z in arrays[1:]:
-						if x not in Z:
+					for (hashed, Z) in others:
+						if not underscore._contains(hashed, Z, x):
 							to_be_added = False
 							break
 					if to_be_added: retval.append(x)
@@ -804,11 +1616,12 @@ class underscore(object):
 		if False in [True if isinstance(x, list) else False for x in others]:
 			raise TypeError("all arguments must be arrays")
 		else:
+			hashed = [(underscore._hashed(A), A) for A in others]
 			retval = []
 			for x in array:
 				to_be_added = True
-				for A in others:
-					if x in A:
+				for (h, A) in hashed:
+					if underscore._contains(h, A, x):
 						to_be_added = False
 						break
 				if to_be_added: retval.append(x)
@@ -816,12 +1629,12 @@ class underscore(object):
 
 	# noinspection PyShadowingNames,PyShadowingNames
 	@staticmethod
-	def uniq(array, iteratee = None, context = None):
+	def uniq(array, iteratee = None, context = None, isSorted = False):
 		"""
         **Aliases**:
             :py:meth:`uniq`, :py:meth:`unique`
 
-        Returns a duplicate-free version of the **array**, based on the **in** operator of Python's list. If you want to compute unique items after a transformation, pass an **iteratee** function (the retained element in the array will be the first one found).
+        Returns a duplicate-free version of the **array**, based on Python's equality of the elements. If you want to compute unique items after a transformation, pass an **iteratee** function (the retained element in the array will be the first one found). If you know in advance that the **array** is sorted, passing ``True`` for **isSorted** will run a much faster algorithm, comparing each element with the previous one only.
 
         Example:
             >>> _.uniq([1, 2, 1, 3, 1, 4, 2])
@@ -833,19 +1646,48 @@ class underscore(object):
         """
 		if not isinstance(array, list):
 			raise TypeError("argument must be an array")
+		return list(underscore.uniqIter(array, iteratee, context, isSorted))
 
-		if len(array) == 0:
-			return []
+	@staticmethod
+	def uniqIter(lst, iteratee = None, context = None, isSorted = False):
+		"""
+        Like :py:meth:`uniq`, but works on any iterable **lst** and returns an iterator: the unique elements are yielded as soon as they are found, i.e., **lst** can be a stream that is not stored in memory. (Hashable values are stored in a set to check uniqueness; with **isSorted** set to ``True`` only the previous value is kept.)
+
+        Example:
+            >>> list(_.uniqIter(iter([1, 2, 1, 3, 1, 4, 2])))
+            [1, 2, 3, 4]
+        """
+		if not isinstance(lst, Iterable):
+			raise TypeError("argument must be Iterable")
+		to_compare = None if iteratee is None else underscore._iteratee1(iteratee, context)
+		return underscore._uniqIter(lst, to_compare, isSorted)
+
+	@staticmethod
+	def _uniqIter(lst, to_compare, isSorted):
+		# The generator of uniqIter, which checks its arguments before the first value is requested
+		if isSorted:
+			first = True
+			last  = None
+			for x in lst:
+				y = x if to_compare is None else to_compare(x)
+				if first or y != last:
+					first = False
+					last  = y
+					yield x
 		else:
-			to_compare = (lambda x: x) if iteratee is None else (lambda x: underscore._exec1(iteratee, context, x))
-			retval      = [array[0]]
-			comparisons = [to_compare(array[0])]
-			for x in array[1:]:
-				y = to_compare(x)
-				if y not in comparisons:
-					retval.append(x)
-					comparisons.append(y)
-			return retval
+			seen       = set()
+			unhashable = []
+			for x in lst:
+				y = x if to_compare is None else to_compare(x)
+				try:
+					if y in seen:
+						continue
+					seen.add(y)
+				except TypeError:
+					if y in unhashable:
+						continue
+					unhashable.append(y)
+				yield x
 
 	@staticmethod
 	def zip(*arrays):
@@ -951,17 +1793,26 @@ class underscore(object):
             >>> stooges2 = [{'name': 'moe', 'age': 40}, {'name': 'curly', 'age': 60}]
             >>> _.sortedIndex(stooges2, {'name': 'larry', 'age': 50}, 'age')
             1
+
+        The **array** may also be a (one dimensional) NumPy array, in which case ``numpy.searchsorted`` is used (if there is no **iteratee**, or if it is a NumPy ufunc or marked by :py:meth:`vectorized`).
         """
 		# The version with a real iteratee is inefficient for larger arrays.
 		# Ideally, the bisect module should be rewritten to use the iteratee directly. T.B.D.
-		if not isinstance(array, list):
+		np = underscore._numpy(array)
+		if np is not None:
+			if iteratee is None:
+				return int(np.searchsorted(array, value))
+			elif underscore._vectorizable(np, iteratee, context):
+				return int(np.searchsorted(iteratee(array), iteratee(np.asarray([value]))[0]))
+		elif not isinstance(array, list):
 			raise TypeError("arguments must be a list")
 		if iteratee is None:
 			a = array
 			v = value
 		else:
-			a = [underscore._exec1(iteratee, context, x) for x in array]
-			v = underscore._exec1(iteratee, context, value)
+			func = underscore._iteratee1(iteratee, context)
+			a = [func(x) for x in array]
+			v = func(value)
 		return bisect.bisect_left(a, v)
 
 	@staticmethod
@@ -988,8 +1839,9 @@ class underscore(object):
 			if endIndex is None:
 				endIndex = len(array)
 
+		func = underscore._iteratee1(predicate, context)
 		for i in range(startIndex, endIndex):
-			if underscore._exec1(predicate, context, array[i]):
+			if func(array[i]):
 				return i
 		return -1
 
@@ -1010,13 +1862,14 @@ class underscore(object):
 			if endIndex is None:
 				endIndex = len(array)
 
+		func = underscore._iteratee1(predicate, context)
 		for i in range(endIndex - 1, startIndex - 1, -1):
-			if underscore._exec1(predicate, context, array[i]):
+			if func(array[i]):
 				return i
 		return -1
 
 	@staticmethod
-	def range(*args):
+	def range(*args, **keywords):
 		"""
         A function to create flexibly-numbered lists of integers, handy for each and map loops. The combination of the arguments can be:
 
@@ -1024,7 +1877,7 @@ class underscore(object):
         * **start**, **end**: like before but starting at **start** instead of 0
         * **start**, **end**, **step**: like before, but stepping with **step** instead of 1. **step** can also be negative
 
-        This is just an alias to Python2's built-in **range** function. In Python3, the result of the same built-in is turned into a list before return.
+        This is just an alias to Python2's built-in **range** function. In Python3, the result of the same built-in is turned into a list before return. If the **asarray** keyword is set to ``True``, a NumPy array is returned instead, created by ``numpy.arange`` (and the arguments may also be floats).
 
         Example:
             >>> _.range(10)
@@ -1033,7 +1886,14 @@ class underscore(object):
             [3, 4, 5, 6, 7, 8, 9]
             >>> _.range(3, 10, 2)
             [3, 5, 7, 9]
-        """
+            >>> _.range(3, 10, 2, asarray = True)
+            array([3, 5, 7, 9])
+        """
+		if False in [k == 'asarray' for k in keywords]:
+			raise TypeError("the only keyword accepted is 'asarray'")
+		if keywords.get('asarray', False):
+			import numpy
+			return numpy.arange(*args)
 		return list(range(*args)) if PY3 else range(*args)
 
 	###############################################################################
@@ -1043,7 +1903,7 @@ class underscore(object):
 	@staticmethod
 	def partial(func, *args, **keywords):
 		"""
-        Return a partially bounded version of the function **func** by fixing any number of its arguments and keywords. You may pass ``None`` in your list of arguments to specify an argument that should not be pre-filled, but left open to supply at call-time.
+        Return a partially bounded version of the function **func** by fixing any number of its arguments and keywords. You may pass ``None`` in your list of arguments to specify an argument that should not be pre-filled, but left open to supply at call-time. The positions of these placeholders are computed once, when the function is created; without placeholders, the result is a ``functools.partial``.
 
         Example:
             >>> substract = lambda a, b: b - a
@@ -1054,26 +1914,77 @@ class underscore(object):
             >>> subFrom20(5)
             15
         """
-		def combine(a, b):
-			retval = ()
-			for i in range(0, len(a)):
-				if a[i] is None:
-					retval += tuple([b[0]])
-					b = b[1:]
-				else:
-					retval += tuple([a[i]])
-			return retval + b
+		if not any(x is None for x in args):
+			return functools.partial(func, *args, **keywords)
+		# The arguments of a call are picked, with a single itemgetter, from the fixed arguments followed by the
+		# arguments of the call: each placeholder takes the next argument of the call, and the remaining arguments of
+		# the call follow. The getters are created once per number of arguments of the calls.
+		n         = 0
+		positions = []
+		for (i, x) in enumerate(args):
+			if x is None:
+				positions.append(len(args) + n)
+				n += 1
+			else:
+				positions.append(i)
+
+		def getter(count):
+			picked = positions + list(range(len(args) + n, len(args) + count))
+			if len(picked) > 1:
+				return operator.itemgetter(*picked)
+			# (an itemgetter with a single position returns the value itself, not a tuple)
+			position = picked[0]
+			return lambda a: (a[position],)
+
+		pick    = getter(n)
+		getters = {}
 
 		def newfunc(*fargs, **fkeywords):
-			newkeywords = keywords.copy()
-			newkeywords.update(fkeywords)
-			return func(*(combine(args, fargs)), **newkeywords)
+			if fkeywords:
+				fkeywords = dict(keywords, **fkeywords)
+			else:
+				fkeywords = keywords
+			if len(fargs) == n:
+				return func(*pick(args + fargs), **fkeywords)
+			try:
+				other = getters[len(fargs)]
+			except KeyError:
+				other = getters.setdefault(len(fargs), getter(len(fargs)))
+			return func(*other(args + fargs), **fkeywords)
 		return newfunc
 
+	@staticmethod
+	def memoize(func, hasher = None, maxsize = None, ttl = None):
+		"""
+        Returns a version of **func** that caches its results: when called again with the same arguments, the cached
+        result is returned without calling **func**. By default the cache key is made of all the arguments and keywords,
+        which must then be hashable; **hasher**, if set, is called with the arguments and keywords and returns the key
+        instead (e.g., ``lambda record: record['id']`` for dictionaries).
+
+        If **maxsize** is set, the least recently used result is removed when the cache would exceed **maxsize**
+        entries. If **ttl** is set, a result expires **ttl** seconds after it has been computed. The function can be used
+        from several threads; the same arguments may however be computed more than once if they are first requested
+        concurrently. The returned function also has a ``cache_info()`` method, returning the ``hits``,
+        ``misses``, ``evictions``, ``maxsize``, and ``currsize`` counters, a ``cache_clear()`` method, and the original
+        function as ``func``.
+
+        Example:
+            >>> fibonacci = _.memoize(lambda n: n if n < 2 else fibonacci(n - 1) + fibonacci(n - 2))
+            >>> fibonacci(80)
+            23416728348467685
+            >>> fibonacci.cache_info()
+            CacheInfo(hits=78, misses=81, evictions=0, maxsize=None, currsize=81)
+        """
+		if not hasattr(func, '__call__'):
+			raise TypeError("argument must be callable")
+		if maxsize is not None and maxsize < 1:
+			raise ValueError("maxsize must be positive")
+		return _memoized(func, hasher, maxsize, ttl)
+
 	@staticmethod
 	def once(func):
 		"""
-        Creates a version of **func**, as a callable object, that can only be called one time. Repeated calls to the modified function will have no effect, returning the value from the original call.
+        Creates a version of **func**, as a callable object, that can only be called one time. Repeated calls to the modified function will have no effect, returning the value from the original call. Concurrent first calls from several threads wait for the single call of **func** to complete.
 
         Example:
             >>> initialize = _.once(createApplication)
@@ -1096,23 +2007,12 @@ class underscore(object):
             >>> delayInit()
             created
         """
-		class _after(object):
-			def __init__(self, after_count, after_func):
-				self.count  = after_count
-				self.called = 0
-				self.func   = after_func
-
-			def __call__(self, *args, **keywords):
-				if self.called == self.count:
-					return self.func(*args, **keywords)
-				else:
-					self.called += 1
-		return _after(count, func)
+		return _After(count, func)
 
 	@staticmethod
 	def before(count, func):
 		"""
-        Creates a version of **func**, as a callable object, that can be called no more than **count** times. The result of the last function call is memorized and returned when count has been reached.
+        Creates a version of **func**, as a callable object, that can be called no more than **count** times. The result of the last function call is memorized and returned when count has been reached. The object can be shared by threads: **func** is never called more than **count** times, and once the count has been reached, the calls take no lock.
 
         Example:
             >>> createOnly3 = _.before(3, createApplication)
@@ -1125,21 +2025,68 @@ class underscore(object):
             >>> createOnly3()
             >>>
         """
-		class _before(object):
-			def __init__(self, before_count, before_func):
-				self.count  = before_count
-				self.called = 0
-				self.retval = None
-				self.func   = before_func
-
-			def __call__(self, *args, **keywords):
-				if self.called < self.count:
-					self.retval = self.func(*args, **keywords)
-					self.called += 1
-					return self.retval
-				else:
-					return self.retval
-		return _before(count, func)
+		return _Before(count, func)
+
+	@staticmethod
+	def throttle(func, wait, leading = True, trailing = True):
+		"""
+        Creates a version of **func** that, when called repeatedly, actually calls **func** at most once every **wait**
+        seconds. The first call is made immediately (unless **leading** is ``False``), and, if there were other calls
+        during the **wait** seconds, a last one with the arguments of the latest of them is made at the end of the period
+        (unless **trailing** is ``False``). The function returns the result of the last actual call of **func**, and has
+        a ``cancel()`` method, dropping the call still to be made, if any.
+
+        The delayed calls are made by a single thread, shared by all the throttled and debounced functions, hence they
+        should be short; the calls still to be made when the program ends are dropped. See :py:meth:`athrottle` for a
+        version using the running ``asyncio`` loop instead.
+
+        Example:
+            >>> flush = _.throttle(flushMetrics, 1.0)
+            >>> for event in events:
+            ...     record(event)
+            ...     flush()
+        """
+		if not hasattr(func, '__call__'):
+			raise TypeError("argument must be callable")
+		return _Throttled(func, wait, leading, trailing, _timers)
+
+	@staticmethod
+	def debounce(func, wait, immediate = False):
+		"""
+        Creates a version of **func** whose calls are postponed until **wait** seconds have elapsed since the last time it
+        was called: **func** is then called once, with the arguments of the last call. If **immediate** is ``True``,
+        **func** is instead called at the beginning of a series of calls, and not at the end. The function returns the
+        result of the last actual call of **func**, and has a ``cancel()`` method. The delayed calls are made as for
+        :py:meth:`throttle`; see :py:meth:`adebounce` for an ``asyncio`` version.
+
+        Example:
+            >>> invalidate = _.debounce(lambda: cache.clear(), 0.5)
+        """
+		if not hasattr(func, '__call__'):
+			raise TypeError("argument must be callable")
+		return _Debounced(func, wait, immediate, _timers)
+
+	@staticmethod
+	def athrottle(func, wait, leading = True, trailing = True):
+		"""
+        A version of :py:meth:`throttle` for ``asyncio``: the delayed calls are scheduled on the running event loop, i.e.,
+        the throttled function must be called from the loop. If **func** returns an awaitable (e.g., if it is a coroutine
+        function), it is run as a task, and the throttled function returns the task of the last actual call.
+        """
+		if not hasattr(func, '__call__'):
+			raise TypeError("argument must be callable")
+		import underscore_async
+		return _Throttled(func, wait, leading, trailing, underscore_async.timers)
+
+	@staticmethod
+	def adebounce(func, wait, immediate = False):
+		"""
+        A version of :py:meth:`debounce` for ``asyncio``, see :py:meth:`athrottle`.
+        """
+		if not hasattr(func, '__call__'):
+			raise TypeError("argument must be callable")
+		import underscore_async
+		return _Debounced(func, wait, immediate, underscore_async.timers)
 
 	@staticmethod
 	def wrap(function, wrapper):
@@ -1179,7 +2126,7 @@ class underscore(object):
 	@staticmethod
 	def compose(*functions):
 		"""
-        Returns the composition of a list of **functions**, where each function consumes the return value of the function that follows. In math terms, composing the functions ``f()``, ``g()``, and ``h()`` produces ``f(g(h()))``. The composition function can be invoked with arguments, which will be used for the arguments of the innermost function (``h()`` in this example).
+        Returns the composition of a list of **functions**, where each function consumes the return value of the function that follows. In math terms, composing the functions ``f()``, ``g()``, and ``h()`` produces ``f(g(h()))``. The composition function can be invoked with arguments, which will be used for the arguments of the innermost function (``h()`` in this example). The functions returned by ``compose`` and ``pipe`` are merged into the composition, rather than nested in it.
 
         Example:
             >>> greet    = lambda name: "hi: " + name
@@ -1189,11 +2136,42 @@ class underscore(object):
             'hi: MOE!'
             >>>
         """
-		def ff(*args,**keywords):
-			nextarg = functions[-1](*args, **keywords)
-			for i in range(len(functions) - 2, -1, -1):
-				nextarg = functions[i](nextarg)
+		return underscore._pipeline(reversed(functions))
+
+	@staticmethod
+	def pipe(*functions):
+		"""
+        Returns the left-to-right composition of a list of **functions**: each function consumes the return value of the function that precedes it. ``_.pipe(h, g, f)`` is ``_.compose(f, g, h)``. The pipeline can be invoked with arguments, which will be used for the arguments of the first function.
+
+        Example:
+            >>> greet    = lambda name: "hi: " + name
+            >>> exclaim  = lambda statement: statement.upper() + "!"
+            >>> welcome  = _.pipe(greet, exclaim)
+            >>> welcome('moe')
+            'HI: MOE!'
+            >>>
+        """
+		return underscore._pipeline(functions)
+
+	@staticmethod
+	def _pipeline(functions):
+		# The functions in the order of their calls; the functions returned by compose and pipe are replaced with
+		# their own stages, so that nested compositions run as a single loop
+		stages = []
+		for f in functions:
+			stages.extend(getattr(f, '_underscore_stages', (f,)))
+		if len(stages) == 0:
+			raise TypeError("argument must be at least one function")
+		stages = tuple(stages)
+		first  = stages[0]
+		rest   = stages[1:]
+
+		def ff(*args, **keywords):
+			nextarg = first(*args, **keywords)
+			for f in rest:
+				nextarg = f(nextarg)
 			return nextarg
+		ff._underscore_stages = stages
 		return ff
 
 	###############################################################################
@@ -1245,8 +2223,8 @@ class underscore(object):
 		if iteratee is None:
 			return underscore.clone(obj)
 		else:
-			transform = lambda key: underscore._exec3(iteratee, context, key, obj[key], obj)
-			return {k: transform(k) for k in obj}
+			transform = underscore._iteratee(iteratee, context)
+			return {k: transform(k, obj[k], obj) for k in obj}
 
 	@staticmethod
 	def pairs(obj, tupl = False):
@@ -1292,7 +2270,7 @@ class underscore(object):
 		if not isinstance(obj, dict):
 			raise TypeError("argument must be a dictionary")
 		else:
-			check = lambda val: underscore._exec1(predicate, context, val)
+			check = underscore._iteratee1(predicate, context)
 			for key in obj:
 				if check(obj[key]):
 					return key
@@ -1455,16 +2433,12 @@ class underscore(object):
             False
             >>> CheckAge(stooges[2])
             True
+
+        **attrs** is copied, and the predicate is ``False`` for anything but a mapping (a dictionary, or any other ``collections.abc.Mapping``). For dictionaries, the predicates are compiled into a dictionary lookup and a single comparison of tuples, and the last 256 of them are reused when **attrs** is equal (this is also the test used by :py:meth:`where`, :py:meth:`findWhere`, and :py:meth:`isMatch`). :py:meth:`filter` and :py:meth:`find` recognize the predicate, and use the hash tables of an :py:class:`Index`.
         """
 		if not isinstance(attrs, dict):
 			raise TypeError("argument must be a dictionary")
-
-		def func(obj):
-			for k in attrs:
-				if k not in obj or obj[k] != attrs[k]:
-					return False
-			return True
-		return func
+		return underscore._matcher(attrs)
 
 	@staticmethod
 	def isMatch(obj, properties):
@@ -1581,21 +2555,43 @@ class underscore(object):
         """
 		return lambda *args: value
 
+	@staticmethod
+	def vectorized(func):
+		"""
+        Marks **func** as a function that can be applied to a full NumPy array (e.g., ``lambda a: a % 2 == 0``), instead of being applied to each element in turn. Methods like :py:meth:`filter`, :py:meth:`sortBy`, :py:meth:`max`, or :py:meth:`countBy` then make a single call with the full array when they get a NumPy array. NumPy's ufuncs (``numpy.sin``, etc.) need not be marked. Returns a wrapper of **func**, i.e., **func** itself is not modified.
+
+        Example:
+            >>> _.sortBy(numpy.array([1, 2, 3, 4, 5, 6]), _.vectorized(lambda a: numpy.sin(a)))
+            array([5, 4, 6, 3, 1, 2])
+        """
+		def wrapper(*args, **keywords):
+			return func(*args, **keywords)
+		functools.update_wrapper(wrapper, func)
+		# (the number of arguments of func is looked up through __wrapped__, which Python 2 does not set)
+		wrapper.__wrapped__ = func
+		wrapper._underscore_vectorized = True
+		return wrapper
+
 	@staticmethod
 	def noop(*args):
 		"""Returns ``None`` irrespective of the arguments passed to it. Useful as the default for optional callback arguments."""
 		return None
 
 	@staticmethod
-	def times(n, iteratee, context = None):
+	def times(n, iteratee, context = None, workers = None, executor = None, chunksize = None):
 		"""
         Invokes the given **iteratee** function **n** times. Each invocation of **iteratee** is called with an index argument. Produces an array of the returned values.
 
+        The **workers**, **executor**, and **chunksize** arguments can be used to run the **iteratee** in parallel, see :py:meth:`map`.
+
         Example:
             >>> _.times(3, _.identity)
             [0, 1, 2]
         """
-		return [underscore._exec1(iteratee, context, i) for i in range(0, n)]
+		func = underscore._iteratee1(iteratee, context)
+		if workers is not None or executor is not None:
+			return underscore._parallel("times", func, 1, range(0, n), None, None, workers, executor, chunksize)
+		return [func(i) for i in range(0, n)]
 
 	@staticmethod
 	def random(min, max = None):
@@ -1623,10 +2619,12 @@ class underscore(object):
 	#                                    Chaining                                 #
 	###############################################################################
 
-	# Chaining is done by creating an instance of underscore, and catching all method requests
+	# Chaining is done by creating an instance of underscore, and catching all method requests. The requests are
+	# not executed right away; they are recorded in a plan, and the plan is only run when value() is invoked.
 	def __init__(self, val):
 		self.current_value = val
 		self.chaining_on   = True
+		self.pending       = []
 
 	# This method catches **all** attribute dereference attempts. This means that any access to the local variables
 	# must be done through the superclass and through the special attributes. A bit convoluted, but does the job...
@@ -1636,9 +2634,15 @@ class underscore(object):
 			def func():
 				#
 				# i.e.:
-				# self.chaining_on = True
+				# self.chaining_on = False
+				# self.current_value = underscore._run_chain(self.current_value, self.pending)
 				# return self.current_value
 				#
+				pending = object.__getattribute__(self, 'pending')
+				if len(pending) != 0:
+					retval = underscore._run_chain(object.__getattribute__(self, 'current_value'), pending)
+					object.__setattr__(self, 'current_value', retval)
+					object.__setattr__(self, 'pending', [])
 				object.__setattr__(self, 'chaining_on', False)
 				return object.__getattribute__(self, 'current_value')
 			return func
@@ -1646,27 +2650,147 @@ class underscore(object):
 			def func(f):
 				#
 				# i.e.:
-				# f(self.current_value)
+				# self.pending.append((None, (f,), {}))
 				# return self
 				#
-				f(object.__getattribute__(self, 'current_value'))
+				object.__getattribute__(self, 'pending').append((None, (f,), {}))
 				return self
 			return func
 		elif name == "__module__" or name == "__doc__" or name not in underscore.__dict__:
 			raise AttributeError(name)
+		elif not isinstance(underscore.__dict__[name], staticmethod):
+			raise AttributeError(name)
 		elif object.__getattribute__(self, 'chaining_on'):
-			def func(*args):
+			def func(*args, **keywords):
 				#
 				# I.e. (approximately)
-				# self.current_value = underscore.`name`(self.current_value,*args)
+				# self.pending.append((`name`, args, keywords))
 				# return self
 				#
-				object.__setattr__(self, 'current_value', underscore.__dict__[name].__func__(object.__getattribute__(self, 'current_value'), *args))
+				object.__getattribute__(self, 'pending').append((name, args, keywords))
 				return self
 			return func
 		else:
 			raise AttributeError("Chained value already retrieved, no more chaining")
 
+	@staticmethod
+	def _run_chain(value, steps):
+		# Element-wise steps are not run one after the other on full lists: they are stacked as generators on top
+		# of each other, and the stack is consumed only when a step needs a real list (or at the end of the chain).
+		# A single pass is made over the data, and no intermediate lists are created.
+		stream = None
+		for (name, args, keywords) in steps:
+			if name is None:
+				# this is a 'tap'
+				if stream is not None:
+					value, stream = list(stream), None
+				args[0](value)
+				continue
+			func = underscore.__dict__[name].__func__
+			# aliases share the same function, hence the same __name__
+			canonical = func.__name__
+			stage = underscore.__dict__[underscore._lazy_stages[canonical]].__func__ if canonical in underscore._lazy_stages else None
+			if stage is not None and underscore._fusable(stage, args, keywords) and not (stream is None and (isinstance(value, (Collection, Index)) or underscore._numpy(value) is not None)):
+				# (a Collection, an Index, or a NumPy array is processed by the methods themselves; a step with options
+				# the stage does not have, e.g., the workers of map, is run by the method itself, on a list)
+				source = value if stream is None else stream
+				staged = stage(source, stream is None, *args, **keywords)
+				# a None means the step is an identity (e.g., map without an iteratee), nothing to stack
+				if staged is not None:
+					stream = staged
+			elif stream is not None and canonical in underscore._lazy_terminals:
+				stage  = underscore.__dict__[underscore._lazy_terminals[canonical]].__func__
+				value, stream = stage(stream, *args, **keywords), None
+			else:
+				if stream is not None:
+					value, stream = list(stream), None
+				value = func(value, *args, **keywords)
+		return value if stream is None else list(stream)
+
+	@staticmethod
+	def _fusable(stage, args, keywords):
+		# Whether the arguments of a step are all accepted by its stage (whose first two arguments are src and head)
+		names = stage.__code__.co_varnames[2:stage.__code__.co_argcount]
+		return len(args) <= len(names) and False not in [key in names[len(args):] for key in keywords]
+
+	@staticmethod
+	def _lazy_map(src, head, iteratee = None, context = None):
+		if iteratee is None:
+			return None
+		func, n = underscore._iteratee_n(iteratee, context, 3)
+		if n <= 1:
+			return (func(x) for x in (src.values() if head and isinstance(src, dict) else src))
+		elif n == 2:
+			if head and isinstance(src, dict):
+				return (func(src[key], key) for key in src)
+			elif head and not isinstance(src, list):
+				return (func(x, None) for x in src)
+			else:
+				return (func(x, i) for (i, x) in enumerate(src))
+		elif head and isinstance(src, list):
+			return (func(x, i, src) for (i, x) in enumerate(src))
+		elif head and isinstance(src, dict):
+			return (func(src[key], key, src) for key in src)
+		elif head:
+			return (func(x, None, None) for x in src)
+		else:
+			# The list of the step is not materialized; the index within the stream is passed instead
+			return (func(x, i, None) for (i, x) in enumerate(src))
+
+	@staticmethod
+	def _lazy_filter(src, head, predicate, context = None):
+		if not isinstance(src, Iterable):
+			raise TypeError("argument must be Iterable")
+		func = underscore._iteratee1(predicate, context)
+		return (x for x in src if func(x))
+
+	@staticmethod
+	def _lazy_reject(src, head, predicate, context = None):
+		if not isinstance(src, Iterable):
+			raise TypeError("argument must be Iterable")
+		func = underscore._iteratee1(predicate, context)
+		return (x for x in src if not func(x))
+
+	@staticmethod
+	def _lazy_where(src, head, properties):
+		if not isinstance(src, Iterable):
+			raise TypeError("argument must be Iterable")
+		if not isinstance(properties, dict):
+			return iter([])
+		return underscore._matching(src, properties)
+
+	@staticmethod
+	def _lazy_pluck(src, head, propertyName):
+		return (l[propertyName] for l in src)
+
+	@staticmethod
+	def _lazy_first(stream, n = None):
+		if n is None:
+			for x in stream:
+				return x
+			raise IndexError("list index out of range")
+		elif n < 0:
+			return list(stream)[0:n]
+		else:
+			return list(itertools.islice(stream, n))
+
+	# Steps of a chain that can be fused into a single pass, and the methods doing it
+	_lazy_stages = {
+		"map"    : "_lazy_map",
+		"filter" : "_lazy_filter",
+		"reject" : "_lazy_reject",
+		"where"  : "_lazy_where",
+		"pluck"  : "_lazy_pluck",
+	}
+
+	# Steps of a chain that can consume a fused stream and stop as soon as the result is known
+	_lazy_terminals = {
+		"first" : "_lazy_first",
+		"find"  : "find",
+		"some"  : "some",
+		"every" : "every",
+	}
+
 	@staticmethod
 	def chain(obj):
 		"""
@@ -1678,6 +2802,8 @@ class underscore(object):
         **tap(func)**
             Execute the function **func** on the value of the wrapped object; the object itself is returned, and can be used for further chaining. This can be used to 'tap into' the chain.
 
+        The methods of a chain are not executed when they are called: they are recorded, and the whole chain is executed when **value()** is invoked (this is also when the functions passed to **tap** are run). Consecutive :py:meth:`map`, :py:meth:`filter`, :py:meth:`reject`, :py:meth:`pluck` and :py:meth:`where` steps are fused into one single pass over the data, without creating intermediate lists; if such steps are followed by :py:meth:`first`, :py:meth:`find`, :py:meth:`some` or :py:meth:`every`, the pass stops as soon as the result is known. Because the intermediate lists are not created, an **iteratee** of a fused :py:meth:`map` that is not the first step of the chain gets the index within the intermediate result and ``None`` instead of the list itself.
+
         Examples:
             >>> _.chain(stooges).sortBy('age').map(lambda st, *args: "%s is %s" % (st['name'], st['age'])).first().value()
             moe is 40
@@ -1689,6 +2815,8 @@ class underscore(object):
             >>> _.chain([1, 2, 3, 200]).filter(lambda num, *args: num % 2 == 0).tap(pr).map(lambda x, *args: x*x).value()
             intermediate: [2, 200]
             [4, 40000]
+            >>> _.chain(_.range(1000000)).map(lambda x, *args: x*x).filter(lambda x: x % 3 == 0).first(3).value()
+            [0, 9, 36]
         """
 		return underscore(obj)
 
@@ -1709,5 +2837,766 @@ class underscore(object):
 	attribute     = property
 	attributeOf   = propertyOf
 
+
+class _Descending(object):
+	# A key compared in reverse order, for the keys of sortBy in descending order
+	__slots__ = ('key',)
+
+	def __init__(self, key):
+		self.key = key
+
+	def __lt__(self, other):
+		return other.key < self.key
+
+	def __eq__(self, other):
+		return self.key == other.key
+
+	def __ne__(self, other):
+		return self.key != other.key
+
+_CacheInfo = namedtuple('CacheInfo', ['hits', 'misses', 'evictions', 'maxsize', 'currsize'])
+
+# Marks the start of the keywords in the cache keys of memoize
+_keywords = object()
+
+_clock = time.monotonic if hasattr(time, 'monotonic') else time.time
+
+def _memoized(func, hasher, maxsize, ttl):
+	# The functions returned by memoize. The cache maps the keys to (value, expiry time) pairs; with a maxsize, it is
+	# an OrderedDict in least recently used order, giving O(1) updates and evictions. The lock is never held while
+	# func is running. The counters are hits, misses, and evictions. With a ttl, the (expiry time, key) pairs are also
+	# queued in the order of the insertions, i.e., of the expiry times, so that the expired entries are removed on
+	# each insertion, even if they are never looked up again.
+	cache    = OrderedDict() if maxsize is not None else {}
+	lock     = threading.Lock()
+	stats    = [0, 0, 0]
+	recent   = getattr(cache, 'move_to_end', None)
+	expiries = deque()
+
+	def purge(now):
+		while len(expiries) != 0 and expiries[0][0] <= now:
+			key   = expiries.popleft()[1]
+			entry = cache.get(key)
+			# (the key may have been computed again since)
+			if entry is not None and entry[1] <= now:
+				del cache[key]
+
+	def wrapper(*args, **keywords):
+		if hasher is not None:
+			key = hasher(*args, **keywords)
+		elif len(keywords) == 0:
+			key = args
+		else:
+			key = args + (_keywords,) + tuple(sorted(keywords.items()))
+		lock.acquire()
+		try:
+			entry = cache.get(key)
+			if entry is not None:
+				if ttl is None or entry[1] > _clock():
+					stats[0] += 1
+					if maxsize is not None:
+						# now the most recently used one
+						if recent is not None:
+							recent(key)
+						else:
+							del cache[key]
+							cache[key] = entry
+					return entry[0]
+				del cache[key]
+			stats[1] += 1
+		finally:
+			lock.release()
+		value = func(*args, **keywords)
+		lock.acquire()
+		try:
+			if ttl is None:
+				cache[key] = (value, None)
+			else:
+				now = _clock()
+				purge(now)
+				cache[key] = (value, now + ttl)
+				expiries.append((now + ttl, key))
+			if maxsize is not None and len(cache) > maxsize:
+				cache.popitem(last = False)
+				stats[2] += 1
+		finally:
+			lock.release()
+		return value
+
+	def cache_info():
+		with lock:
+			if ttl is not None:
+				purge(_clock())
+			return _CacheInfo(stats[0], stats[1], stats[2], maxsize, len(cache))
+
+	def cache_clear():
+		with lock:
+			cache.clear()
+			expiries.clear()
+			stats[:] = [0, 0, 0]
+
+	functools.update_wrapper(wrapper, func)
+	wrapper.cache_info  = cache_info
+	wrapper.cache_clear = cache_clear
+	wrapper.func        = func
+	return wrapper
+
+class _Timers(object):
+	# The timers of throttle and debounce: a single daemon thread, started on first use, runs the callbacks in the
+	# order of their due times (a heap of (time, sequence number, timer) entries).
+	def __init__(self):
+		self.condition = threading.Condition()
+		self.queue     = []
+		self.sequence  = itertools.count()
+		self.thread    = None
+
+	def schedule(self, delay, callback):
+		timer = _Timer(callback)
+		with self.condition:
+			entry = (_clock() + delay, next(self.sequence), timer)
+			heapq.heappush(self.queue, entry)
+			if self.thread is None:
+				self._start()
+			if self.queue[0] is entry:
+				# the thread may be waiting for a later timer
+				self.condition.notify()
+		return timer
+
+	@staticmethod
+	def run(func, call):
+		(args, keywords) = call
+		return func(*args, **keywords)
+
+	def _start(self):
+		self.thread = threading.Thread(target = self._run, name = "underscore-timers")
+		self.thread.daemon = True
+		self.thread.start()
+
+	def _forked(self):
+		# Only the thread calling fork exists in the child process (and the condition may have been held by another
+		# one): the timers pending in the child are run by a new thread
+		self.condition = threading.Condition()
+		self.thread    = None
+		if len(self.queue) != 0:
+			self._start()
+
+	def _run(self):
+		with self.condition:
+			while True:
+				if len(self.queue) == 0:
+					self.condition.wait()
+					continue
+				delay = self.queue[0][0] - _clock()
+				if delay > 0:
+					self.condition.wait(delay)
+					continue
+				callback = heapq.heappop(self.queue)[2].callback
+				if callback is None:
+					# cancelled
+					continue
+				self.condition.release()
+				try:
+					callback()
+				except Exception:
+					traceback.print_exc()
+				finally:
+					self.condition.acquire()
+
+class _Timer(object):
+	__slots__ = ('callback',)
+
+	def __init__(self, callback):
+		self.callback = callback
+
+	def cancel(self):
+		self.callback = None
+
+_timers = _Timers()
+if hasattr(os, 'register_at_fork'):
+	os.register_at_fork(after_in_child = _timers._forked)
+
+# The callable objects of before (hence once) and after. Once 'done' is set, the calls take no lock; until then, the
+# state is checked again and updated with the lock held (the lock is reentrant, for functions calling themselves).
+class _Before(object):
+	__slots__ = ('count', 'called', 'retval', 'func', 'done', 'lock')
+
+	def __init__(self, count, func):
+		self.count  = count
+		self.called = 0
+		self.retval = None
+		self.func   = func
+		self.done   = count <= 0
+		self.lock   = threading.RLock()
+
+	def __call__(self, *args, **keywords):
+		if self.done:
+			return self.retval
+		with self.lock:
+			if self.called < self.count:
+				self.retval = self.func(*args, **keywords)
+				self.called += 1
+				if self.called >= self.count:
+					self.done = True
+			return self.retval
+
+class _After(object):
+	__slots__ = ('count', 'called', 'func', 'done', 'lock')
+
+	def __init__(self, count, func):
+		self.count  = count
+		self.called = 0
+		self.func   = func
+		self.done   = count <= 0
+		# (func is never called while the lock is held)
+		self.lock   = threading.Lock()
+
+	def __call__(self, *args, **keywords):
+		if self.done:
+			# the count has been reached: no lock is taken
+			return self.func(*args, **keywords)
+		with self.lock:
+			if self.called < self.count:
+				self.called += 1
+				if self.called >= self.count:
+					self.done = True
+				return None
+		return self.func(*args, **keywords)
+
+class _Throttled(object):
+	# The functions returned by throttle: 'previous' is the time of the last call of func (None: no call yet, or none
+	# since the last trailing call, without leading calls), 'pending' the arguments of the trailing call, if any.
+	__slots__ = ('func', 'wait', 'leading', 'trailing', 'timers', 'lock', 'previous', 'pending', 'timer', 'result')
+
+	def __init__(self, func, wait, leading, trailing, timers):
+		self.func     = func
+		self.wait     = wait
+		self.leading  = leading
+		self.trailing = trailing
+		self.timers   = timers
+		self.lock     = threading.Lock()
+		self.previous = None
+		self.pending  = None
+		self.timer    = None
+		self.result   = None
+
+	def __call__(self, *args, **keywords):
+		now = _clock()
+		with self.lock:
+			if self.previous is None and not self.leading:
+				self.previous = now
+			remaining = 0 if self.previous is None else self.wait - (now - self.previous)
+			if remaining <= 0:
+				if self.timer is not None:
+					self.timer.cancel()
+					self.timer = None
+				self.previous = now
+				self.pending  = None
+			else:
+				self.pending = (args, keywords)
+				if self.timer is None and self.trailing:
+					self.timer = self.timers.schedule(remaining, self._later)
+				return self.result
+		self.result = self.timers.run(self.func, (args, keywords))
+		return self.result
+
+	def _later(self):
+		with self.lock:
+			self.previous = _clock() if self.leading else None
+			self.timer    = None
+			pending, self.pending = self.pending, None
+		if pending is not None:
+			self.result = self.timers.run(self.func, pending)
+
+	def cancel(self):
+		with self.lock:
+			if self.timer is not None:
+				self.timer.cancel()
+			self.previous = self.pending = self.timer = None
+
+class _Debounced(object):
+	# The functions returned by debounce: 'last' is the time of the last call. The timer is not rescheduled on each
+	# call: when it expires, it is restarted for the remaining time if there has been a call in the meantime.
+	__slots__ = ('func', 'wait', 'immediate', 'timers', 'lock', 'last', 'pending', 'timer', 'result')
+
+	def __init__(self, func, wait, immediate, timers):
+		self.func      = func
+		self.wait      = wait
+		self.immediate = immediate
+		self.timers    = timers
+		self.lock      = threading.Lock()
+		self.last      = None
+		self.pending   = None
+		self.timer     = None
+		self.result    = None
+
+	def __call__(self, *args, **keywords):
+		with self.lock:
+			self.last = _clock()
+			now = self.immediate and self.timer is None
+			if self.timer is None:
+				self.timer = self.timers.schedule(self.wait, self._later)
+			if not self.immediate:
+				self.pending = (args, keywords)
+			if not now:
+				return self.result
+		self.result = self.timers.run(self.func, (args, keywords))
+		return self.result
+
+	def _later(self):
+		with self.lock:
+			remaining = self.wait - (_clock() - self.last)
+			if remaining > 0:
+				self.timer = self.timers.schedule(remaining, self._later)
+				return
+			self.timer = None
+			pending, self.pending = self.pending, None
+		if pending is not None:
+			self.result = self.timers.run(self.func, pending)
+
+	def cancel(self):
+		with self.lock:
+			if self.timer is not None:
+				self.timer.cancel()
+			self.pending = self.timer = None
+
+class lazy(object):
+	"""
+    Iterator versions of the element-wise methods, accessed as, e.g., ``_.lazy.map``. They take the same arguments as their counterparts, but **lst** may be any iterable (e.g., a file, a database cursor, or a generator), and the result is an iterator, computing the values one by one as they are requested; i.e., arbitrary large streams can be processed in constant memory::
+
+        >>> with open('log.txt') as log:
+        ...     for line in _.lazy.filter(_.lazy.map(log, lambda l: l.strip()), lambda l: l.startswith('ERROR')):
+        ...         print(line)
+
+    The available methods are ``map``, ``filter``, ``reject``, ``pluck``, ``where``, ``compact``, ``without``, ``zip``, ``uniq``, ``flatten``, and ``sortBy`` (an external sort, for iterables too large to be sorted in memory). As for :py:meth:`underscore.map` on an iterator, the **iteratee** of ``map`` is invoked with ``None`` as a second and third argument, unless **lst** is a list or a dictionary.
+    """
+
+	@staticmethod
+	def map(lst, iteratee = None, context = None):
+		if not isinstance(lst, Iterable):
+			raise TypeError("argument must be Iterable")
+		retval = underscore._lazy_map(lst, True, iteratee, context)
+		if retval is None:
+			return iter(lst.values() if isinstance(lst, dict) else lst)
+		return retval
+
+	@staticmethod
+	def filter(lst, predicate, context = None):
+		return underscore._lazy_filter(lst, True, predicate, context)
+
+	@staticmethod
+	def reject(lst, predicate, context = None):
+		return underscore._lazy_reject(lst, True, predicate, context)
+
+	@staticmethod
+	def pluck(lst, propertyName):
+		if not isinstance(lst, Iterable):
+			raise TypeError("argument must be Iterable")
+		return underscore._lazy_pluck(lst, True, propertyName)
+
+	@staticmethod
+	def where(lst, properties):
+		return underscore._lazy_where(lst, True, properties)
+
+	@staticmethod
+	def compact(lst):
+		if not isinstance(lst, Iterable):
+			raise TypeError("argument must be Iterable")
+		return (x for x in lst if underscore._falsy(x) is not True)
+
+	@staticmethod
+	def without(lst, *values):
+		if not isinstance(lst, Iterable):
+			raise TypeError("argument must be Iterable")
+		return (x for x in lst if x not in values)
+
+	@staticmethod
+	def zip(*iterables):
+		if False in [isinstance(x, Iterable) for x in iterables]:
+			raise TypeError("all arguments must be Iterable")
+		zipped = zip(*iterables) if PY3 else itertools.izip(*iterables)
+		return zipped if len(iterables) != 0 and isinstance(iterables[0], tuple) else (list(x) for x in zipped)
+
+	@staticmethod
+	def uniq(lst, iteratee = None, context = None, isSorted = False):
+		return underscore.uniqIter(lst, iteratee, context, isSorted)
+
+	@staticmethod
+	def flatten(lst, shallow = False, depth = None, containers = (list,)):
+		return underscore.flattenIter(lst, shallow, depth, containers)
+
+	@staticmethod
+	def sortBy(lst, iteratee = None, context = None, budget = 100000, directory = None, fanIn = 64):
+		"""
+        An external version of :py:meth:`underscore.sortBy`, for iterables too large to be sorted in memory: **lst** is
+        read in runs of **budget** values, each run is sorted in memory, and written to a temporary file (in the
+        **directory**, or the default one of :py:mod:`tempfile`) with :py:mod:`pickle`, in blocks of
+        ``budget // fanIn`` values. The iterator returned merges the runs, reading them block by block. At most **fanIn**
+        runs are merged at a time: if there are more, groups of **fanIn** runs are first merged into longer runs (written
+        to new files), until there are at most **fanIn** of them. I.e., at most **budget** values are in memory, and at
+        most **fanIn** files are open at a time. The files are removed when the iterator is exhausted or deleted. If
+        **lst** has less than **budget** values, no file is created.
+
+        The keys are those of :py:meth:`underscore.sortBy`, including lists of keys and descending keys, and the sort is
+        stable. The values must be picklable. Example::
+
+            >>> with open('events.log') as log:
+            ...     for line in _.lazy.sortBy(log, lambda l: l.split()[1], budget = 1000000):
+            ...         print(line)
+        """
+		if not isinstance(lst, Iterable):
+			raise TypeError("argument must be Iterable")
+		if budget < 1:
+			raise ValueError("budget must be positive")
+		if fanIn < 2:
+			raise ValueError("fanIn must be at least 2")
+		return lazy._external(iter(lst), iteratee, context, budget, directory, fanIn)
+
+	@staticmethod
+	def _external(values, iteratee, context, budget, directory, fanIn):
+		# all the files created, closed (and removed) at the end, whatever happens
+		files = []
+		block = max(1, budget // fanIn)
+		try:
+			runs = []
+			while True:
+				run = list(itertools.islice(values, budget))
+				underscore.sortBy(run, iteratee, context, inPlace = True)
+				if len(runs) == 0 and len(run) < budget:
+					# everything fits in memory
+					for x in run:
+						yield x
+					return
+				if len(run) != 0:
+					files.append(lazy._write(run, directory, block))
+					runs.append(files[-1])
+				if len(run) < budget:
+					break
+			run = None
+			(key, reverse) = lazy._mergeKey(iteratee, context)
+			# groups of consecutive runs are merged, so that the ties stay in order
+			while len(runs) > fanIn:
+				merged = []
+				for i in range(0, len(runs), fanIn):
+					group = runs[i:i + fanIn]
+					if len(group) == 1:
+						merged.append(group[0])
+						continue
+					files.append(lazy._write(lazy._merge(group, key, reverse), directory, block))
+					merged.append(files[-1])
+					for f in group:
+						f.close()
+				runs = merged
+			for x in lazy._merge(runs, key, reverse):
+				yield x
+		finally:
+			for f in files:
+				f.close()
+
+	@staticmethod
+	def _write(values, directory, block):
+		# A new run file, with the values in blocks of the given size, ready to be read
+		f = tempfile.TemporaryFile(dir = directory)
+		values = iter(values)
+		while True:
+			chunk = list(itertools.islice(values, block))
+			if len(chunk) == 0:
+				break
+			pickle.dump(chunk, f, pickle.HIGHEST_PROTOCOL)
+		f.seek(0)
+		return f
+
+	@staticmethod
+	def _merge(runs, key, reverse):
+		# The merged items are (key, run, position, value): ties are resolved by the order of the runs and of the
+		# values in the runs, i.e., the values themselves are never compared. If all the keys are descending, the
+		# runs are merged in reverse order, with negated run numbers and positions to keep the ties in order.
+		sign   = -1 if reverse else 1
+		merged = heapq.merge(*[lazy._items(f, key, sign * i, sign) for (i, f) in enumerate(runs)], **({'reverse': True} if reverse else {}))
+		return map(operator.itemgetter(3), merged) if PY3 else itertools.imap(operator.itemgetter(3), merged)
+
+	@staticmethod
+	def _items(f, key, i, step):
+		# The items of a run, built at C level, block by block
+		positions = itertools.count(0, step)
+		zipped    = zip if PY3 else itertools.izip
+		return itertools.chain.from_iterable(zipped(map(key, block) if PY3 else itertools.imap(key, block), itertools.repeat(i), positions, block) for block in lazy._blocks(f))
+
+	@staticmethod
+	def _blocks(f):
+		while True:
+			try:
+				yield pickle.load(f)
+			except EOFError:
+				return
+
+	@staticmethod
+	def _mergeKey(iteratee, context):
+		# The key of sortBy for a value, and whether the runs are merged in reverse order. If the keys have different
+		# directions, the descending ones are wrapped by _Descending (comparisons are then made in Python, hence slower).
+		keys       = underscore._sortKeys(iteratee)
+		getters    = [underscore.identity if key is None else underscore._key(key, context) for (key, descending) in keys]
+		directions = set(descending for (key, descending) in keys)
+		if len(directions) == 1 and (PY3 or directions == set([False])):
+			if len(getters) == 1:
+				return (getters[0], keys[0][1])
+			elif False not in [isinstance(key, basestring) for (key, descending) in keys]:
+				return (operator.itemgetter(*[key for (key, descending) in keys]), keys[0][1])
+			return (lambda x: tuple([getter(x) for getter in getters]), keys[0][1])
+		wrappers = [_Descending if descending else underscore.identity for (key, descending) in keys]
+		return (lambda x: tuple([wrapper(getter(x)) for (wrapper, getter) in zip(wrappers, getters)]), False)
+
+# The lazy methods are accessed through the underscore class, e.g., _.lazy.map
+underscore.lazy = lazy
+
+
+# Placeholder for the properties missing from some of the dictionaries of a Collection
+_missing = object()
+
+class Collection(object):
+	"""
+    A columnar representation of a list of dictionaries (“records”), like ``stooges`` or ``listOfPlays``: the values of each property are stored in one list per property, instead of one dictionary per record. Properties missing from some of the records are allowed. Example::
+
+        >>> plays = Collection(listOfPlays)
+        >>> plays.fields()
+        ['author', 'year', 'title']
+        >>> plays.column('year')
+        [1611, 1611, 1601]
+        >>> _.where(plays, {'year': 1611}).toList()
+        [{'author': 'Shakespeare', 'year': 1611, 'title': 'The tempest'}, {'author': 'Shakespeare', 'year': 1611, 'title': 'Cymbeline'}]
+
+    A collection can be used in place of the list of dictionaries with the underscore methods. :py:meth:`underscore.pluck`, :py:meth:`underscore.where`, :py:meth:`underscore.findWhere`, :py:meth:`underscore.groupBy`, :py:meth:`underscore.indexBy`, :py:meth:`underscore.countBy`, :py:meth:`underscore.sortBy`, and (with a property name as iteratee) :py:meth:`underscore.max` and :py:meth:`underscore.min` work column at a time, and return collections where the original methods would return lists of dictionaries. The other methods see the collection as an iterable of dictionaries, created on the fly.
+    """
+
+	def __init__(self, rows = None):
+		self.columns = OrderedDict()
+		self.length  = 0
+		if rows is None:
+			return
+		if not isinstance(rows, Iterable):
+			raise TypeError("argument must be Iterable")
+		for row in rows:
+			if not isinstance(row, dict):
+				raise TypeError("the elements must be dictionaries")
+			for key in row:
+				if key not in self.columns:
+					self.columns[key] = [_missing] * self.length
+			for key in self.columns:
+				self.columns[key].append(row.get(key, _missing))
+			self.length += 1
+
+	@staticmethod
+	def fromColumns(columns):
+		"""Create a collection from a dictionary of property names and (equal length) lists of values."""
+		if not isinstance(columns, dict):
+			raise TypeError("argument must be a dictionary")
+		lengths = set(len(columns[key]) for key in columns)
+		if len(lengths) > 1:
+			raise ValueError("columns must have the same length")
+		retval = Collection()
+		for key in columns:
+			retval.columns[key] = list(columns[key])
+		retval.length = lengths.pop() if len(lengths) != 0 else 0
+		return retval
+
+	def fields(self):
+		"""The list of the property names."""
+		return list(self.columns.keys())
+
+	def column(self, name):
+		"""The list of values of the property **name**, ``None`` for the records that do not have it; ``KeyError`` is raised if the property does not exist."""
+		return [None if x is _missing else x for x in self.columns[name]]
+
+	def row(self, i):
+		"""The **i**-th record, as a new dictionary."""
+		return {key: self.columns[key][i] for key in self.columns if self.columns[key][i] is not _missing}
+
+	def take(self, indices):
+		"""A new collection, made of the records at the positions listed in **indices**."""
+		indices = list(indices)
+		retval  = Collection()
+		if len(indices) == 1:
+			for key in self.columns:
+				retval.columns[key] = [self.columns[key][indices[0]]]
+		elif len(indices) != 0:
+			# itemgetter picks all the values of a column in one (C level) call
+			getter = operator.itemgetter(*indices)
+			for key in self.columns:
+				retval.columns[key] = list(getter(self.columns[key]))
+		else:
+			for key in self.columns:
+				retval.columns[key] = []
+		retval.length = len(indices)
+		return retval
+
+	def toList(self):
+		"""Convert the collection back into a list of dictionaries."""
+		return [self.row(i) for i in range(0, self.length)]
+
+	def __len__(self):
+		return self.length
+
+	def __iter__(self):
+		for i in range(0, self.length):
+			yield self.row(i)
+
+	def __repr__(self):
+		return "Collection(%r)" % self.toList()
+
+	def _matching(self, properties):
+		# The positions of the records matching properties, filtering one column after the other
+		if not isinstance(properties, dict):
+			return []
+		indices = None
+		for key in properties:
+			if key not in self.columns:
+				return []
+			column = self.columns[key]
+			value  = properties[key]
+			if indices is None:
+				indices = [i for (i, x) in enumerate(column) if x is not _missing and x == value]
+			else:
+				indices = [i for i in indices if column[i] is not _missing and column[i] == value]
+			if len(indices) == 0:
+				break
+		return list(range(0, self.length)) if indices is None else indices
+
+	def _values(self, name):
+		# The values of the property name (not a copy); as for a list of dictionaries, KeyError is raised if some of the
+		# records do not have it
+		column = self.columns[name]
+		if any(map(operator.is_, column, itertools.repeat(_missing))):
+			raise KeyError(name)
+		return column
+
+	def _keys(self, iteratee, context):
+		# The values of a property (or of an iteratee on the records), one per record
+		if isinstance(iteratee, basestring):
+			return self._values(iteratee)
+		elif isinstance(iteratee, (list, tuple)):
+			return list(zip(*[self._values(name) for name in iteratee]))
+		else:
+			key = underscore._key(iteratee, context)
+			return [key(r) for r in self]
+
+	def _groups(self, iteratee, context):
+		# The positions of the records, grouped by the value of a property (or of an iteratee on the records)
+		retval = {}
+		for (i, key) in enumerate(self._keys(iteratee, context)):
+			if key in retval:
+				retval[key].append(i)
+			else:
+				retval[key] = [i]
+		return retval
+
+class Index(object):
+	"""
+    A list of dictionaries (e.g., ``listOfPlays``), together with hash tables on some of their properties; :py:meth:`underscore.where`, :py:meth:`underscore.findWhere`, and :py:meth:`underscore.filter` or :py:meth:`underscore.find` with a predicate created by :py:meth:`underscore.matcher` look up the hash tables instead of checking every dictionary, whenever the properties searched for include all the properties of a table. Each **key** is a property name, or a tuple of property names for a composite table. Example::
+
+        >>> plays = Index(listOfPlays, 'title', ('author', 'year'))
+        >>> _.findWhere(plays, {'title': 'Cymbeline'})
+        {'author': 'Shakespeare', 'year': 1611, 'title': 'Cymbeline'}
+        >>> _.where(plays, {'author': 'Shakespeare', 'year': 1611})
+        [{'author': 'Shakespeare', 'year': 1611, 'title': 'The tempest'}, {'author': 'Shakespeare', 'year': 1611, 'title': 'Cymbeline'}]
+
+    The index keeps a reference to **lst** (if it is a list; other iterables are copied into a new list, available as the ``list`` attribute). Dictionaries must be added or removed through :py:meth:`append`, :py:meth:`extend`, and :py:meth:`remove` to keep the tables up to date; if the indexed properties of a dictionary are changed in place, or the list is modified directly, :py:meth:`rebuild` must be called. Queries on properties not covered by a table, or with unhashable values, go through the full list. An index can also be used in place of the list with the methods taking any iterable (e.g., :py:meth:`underscore.each`, :py:meth:`underscore.map`, :py:meth:`underscore.reduce`, :py:meth:`underscore.groupBy`, :py:meth:`underscore.sortBy`, :py:meth:`underscore.sample`); the methods requiring a list (e.g., :py:meth:`underscore.first`, :py:meth:`underscore.last`, :py:meth:`underscore.uniq`, :py:meth:`underscore.findIndex`) must be given the ``list`` attribute instead.
+    """
+
+	def __init__(self, lst, *keys):
+		if not isinstance(lst, Iterable):
+			raise TypeError("argument must be Iterable")
+		self.list = lst if isinstance(lst, list) else list(lst)
+		self.keys = []
+		for key in keys:
+			names = (key,) if isinstance(key, basestring) else tuple(key)
+			if len(names) == 0 or False in [isinstance(name, basestring) for name in names]:
+				raise TypeError("keys must be property names or tuples of property names")
+			self.keys.append(names)
+		# the tables are in the order of the keys; a table maps tuples of values to the dictionaries having them
+		self.tables = []
+		self.rebuild()
+
+	def rebuild(self):
+		"""Recompute all the hash tables from the list."""
+		self.tables = [{} for names in self.keys]
+		for obj in self.list:
+			self._add(obj)
+
+	def append(self, obj):
+		"""Append the dictionary **obj** to the list and to the hash tables."""
+		if not isinstance(obj, dict):
+			raise TypeError("argument must be a dictionary")
+		self.list.append(obj)
+		self._add(obj)
+
+	def extend(self, lst):
+		"""Append all the dictionaries of **lst**."""
+		for obj in lst:
+			self.append(obj)
+
+	def remove(self, obj):
+		"""Remove the first occurrence of **obj** from the list and from the hash tables; ``ValueError`` is raised if **obj** is not in the list."""
+		self.list.remove(obj)
+		for (names, table) in zip(self.keys, self.tables):
+			value = Index._value(obj, names)
+			if value is not None and value in table:
+				bucket = table[value]
+				for (i, x) in enumerate(bucket):
+					if x is obj or x == obj:
+						del bucket[i]
+						break
+				if len(bucket) == 0:
+					del table[value]
+
+	def __len__(self):
+		return len(self.list)
+
+	def __iter__(self):
+		return iter(self.list)
+
+	def __getitem__(self, i):
+		return self.list[i]
+
+	def __repr__(self):
+		return "Index(%r, %s)" % (self.list, ", ".join(repr(names[0] if len(names) == 1 else names) for names in self.keys))
+
+	@staticmethod
+	def _value(obj, names):
+		# The key of obj in the table on names, or None if obj has not all the properties, or unhashable values
+		if not isinstance(obj, dict):
+			return None
+		try:
+			value = tuple(obj[name] for name in names)
+			hash(value)
+			return value
+		except (KeyError, TypeError):
+			return None
+
+	def _add(self, obj):
+		for (names, table) in zip(self.keys, self.tables):
+			value = Index._value(obj, names)
+			if value is not None:
+				if value in table:
+					table[value].append(obj)
+				else:
+					table[value] = [obj]
+
+	def _candidates(self, properties):
+		# The dictionaries that may match properties: a bucket of the largest table covered by the properties, or the
+		# full list if there is none
+		if not isinstance(properties, dict):
+			return self.list
+		best = None
+		for (names, table) in zip(self.keys, self.tables):
+			if (best is None or len(names) > len(best[0])) and False not in [name in properties for name in names]:
+				value = Index._value(properties, names)
+				if value is not None:
+					best = (names, table.get(value, []))
+		return self.list if best is None else best[1]
+
+	def _matching(self, properties):
+		if not isinstance(properties, dict):
+			return []
+		return list(underscore._matching(self._candidates(properties), properties))
+
 if __name__ == '__main__':
 	pass
@@ -0,0 +1,190 @@
+#!/usr/bin/env python
+# coding=utf-8
+"""
+asyncio versions of some of the collection functions of :py:mod:`underscore`. These are accessed through the
+``amap``, ``afilter``, ``aeach``, ``afind``, ``asome`` and ``agroupBy`` methods of the ``underscore`` class; they are
+kept in a separate module because the ``async`` syntax is not available in Python 2. The module also provides the
+timers of ``athrottle`` and ``adebounce``.
+
+The iteratees may be plain functions or coroutine functions (in fact, anything returning an awaitable is awaited).
+The input may be a list, a dictionary, any iterable, or an asynchronous iterable. At most ``limit`` calls of the
+iteratee are running at any time (``None`` meaning no limit); an asynchronous iterable is consumed only as fast as
+the calls are started. With a ``limit``, if a call fails, no more calls are started, the running ones are cancelled,
+and the exception is raised.
+"""
+import asyncio
+import inspect
+from collections import deque
+
+from underscore import underscore
+
+async def _call(func, args):
+	retval = func(*args)
+	if inspect.isawaitable(retval):
+		retval = await retval
+	return retval
+
+async def _items(lst):
+	# (value, index, list) triples, as expected by the iteratees of each and map
+	if hasattr(lst, '__aiter__'):
+		async for x in lst:
+			yield (x, None, None)
+	elif isinstance(lst, list):
+		for (i, x) in enumerate(lst):
+			yield (x, i, lst)
+	elif isinstance(lst, dict):
+		for key in lst:
+			yield (lst[key], key, lst)
+	else:
+		for x in lst:
+			yield (x, None, None)
+
+async def _values(lst):
+	if hasattr(lst, '__aiter__'):
+		async for x in lst:
+			yield x
+	else:
+		for x in lst:
+			yield x
+
+async def _singles(values, seen):
+	# The values as argument tuples, also appended to 'seen', i.e., in the order of the tasks
+	async for x in values:
+		seen.append(x)
+		yield (x,)
+
+async def _spawn(source, func, n, limit):
+	# Starts a task for each argument tuple of the source; a new task is started only if there are less than 'limit'
+	# tasks running. If a task has failed in the meantime, no more tasks are started, and its exception is raised.
+	semaphore = asyncio.Semaphore(limit) if limit is not None else None
+	tasks     = []
+	failed    = []
+
+	def completed(task):
+		semaphore.release()
+		if not task.cancelled() and task.exception() is not None:
+			failed.append(task)
+
+	try:
+		async for args in source:
+			if semaphore is not None:
+				await semaphore.acquire()
+				if len(failed) != 0:
+					raise failed[0].exception()
+			task = asyncio.ensure_future(_call(func, args[:n]))
+			if semaphore is not None:
+				task.add_done_callback(completed)
+			tasks.append(task)
+	except BaseException:
+		_cancel(tasks)
+		raise
+	return tasks
+
+def _cancel(tasks):
+	for task in tasks:
+		task.cancel()
+
+async def _gather(tasks):
+	try:
+		return await asyncio.gather(*tasks)
+	except BaseException:
+		_cancel(tasks)
+		raise
+
+async def amap(lst, iteratee, context, limit):
+	func, n = underscore._iteratee_n(iteratee, context, 3)
+	return await _gather(await _spawn(_items(lst), func, max(n, 1), limit))
+
+async def aeach(lst, iteratee, context, limit):
+	func, n = underscore._iteratee_n(iteratee, context, 3)
+	await _gather(await _spawn(_items(lst), func, max(n, 1), limit))
+	return lst if isinstance(lst, (list, dict)) else None
+
+async def afilter(lst, predicate, context, limit):
+	values = []
+	func   = underscore._iteratee1(predicate, context)
+	passed = await _gather(await _spawn(_singles(_values(lst), values), func, 1, limit))
+	return [x for (x, ok) in zip(values, passed) if ok]
+
+async def agroupBy(lst, iteratee, context, limit):
+	values = []
+	func   = underscore._iteratee1(iteratee, context)
+	keys   = await _gather(await _spawn(_singles(_values(lst), values), func, 1, limit))
+	retval = {}
+	for (key, x) in zip(keys, values):
+		if key in retval:
+			retval[key].append(x)
+		else:
+			retval[key] = [x]
+	return retval
+
+async def _search(lst, predicate, context, limit, ordered):
+	# Returns (True, value) for a value passing the predicate, (False, None) if there is none. If 'ordered', the
+	# value is the first one in the order of lst, otherwise the first one found. The tasks still running (and the
+	# ones not yet started) are cancelled as soon as the answer is known.
+	func      = underscore._iteratee1(predicate, context)
+	semaphore = asyncio.Semaphore(limit) if limit is not None else None
+	# ordered: the tasks in the order of lst, not yet checked; otherwise the tasks completed, not yet checked
+	pending   = deque()
+	running   = set()
+
+	def check():
+		while len(pending) != 0 and pending[0][1].done():
+			(x, task) = pending.popleft()
+			if task.result():
+				return (True, x)
+		return None
+
+	def completed(x):
+		def callback(task):
+			running.discard(task)
+			if semaphore is not None:
+				semaphore.release()
+			if not ordered and not task.cancelled():
+				pending.append((x, task))
+		return callback
+
+	try:
+		async for x in _values(lst):
+			if semaphore is not None:
+				await semaphore.acquire()
+			task = asyncio.ensure_future(_call(func, (x,)))
+			task.add_done_callback(completed(x))
+			running.add(task)
+			if ordered:
+				pending.append((x, task))
+			found = check()
+			if found is not None:
+				return found
+		while len(running) != 0 or len(pending) != 0:
+			found = check()
+			if found is not None:
+				return found
+			if len(running) != 0:
+				await asyncio.wait(running if not ordered else [pending[0][1]], return_when=asyncio.FIRST_COMPLETED)
+		return (False, None)
+	finally:
+		_cancel(list(running))
+
+async def afind(lst, predicate, context, limit):
+	return (await _search(lst, predicate, context, limit, True))[1]
+
+async def asome(lst, predicate, context, limit):
+	return (await _search(lst, predicate, context, limit, False))[0]
+
+class _LoopTimers(object):
+	# The timers of athrottle and adebounce, on the running loop (the TimerHandle of call_later has a cancel method)
+	@staticmethod
+	def schedule(delay, callback):
+		return asyncio.get_running_loop().call_later(delay, callback) if hasattr(asyncio, 'get_running_loop') \
+			else asyncio.get_event_loop().call_later(delay, callback)
+
+	@staticmethod
+	def run(func, call):
+		(args, keywords) = call
+		retval = func(*args, **keywords)
+		if inspect.isawaitable(retval):
+			return asyncio.ensure_future(retval)
+		return retval
+
+timers = _LoopTimers()